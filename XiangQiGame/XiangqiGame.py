@@ -3,13 +3,186 @@
 # Description: Replicates the abstract board game called Xiangqi. Includes all of the game's pieces and the board.
 #              The game ends when one general is put into checkmate.
 
+import random
+from collections import OrderedDict
+
+# Move tables, built once at import and shared by every part of the engine.
+# Squares use algebraic notation throughout, e.g. 'e1' is the Red General's starting square.
+SQUARES = [chr(col + 97) + str(row) for row in range(1, 11) for col in range(9)]
+BOARD_SQUARES = set(SQUARES)
+
+# The palaces and the squares each side's Advisors and Elephants may stand on.
+PALACE = {'red': {'d1', 'd2', 'd3', 'e1', 'e2', 'e3', 'f1', 'f2', 'f3'},
+          'black': {'d8', 'd9', 'd10', 'e8', 'e9', 'e10', 'f8', 'f9', 'f10'}}
+ADVISOR_SQUARES = {'red': {'d1', 'd3', 'e2', 'f1', 'f3'},
+                   'black': {'d8', 'd10', 'e9', 'f8', 'f10'}}
+ELEPHANT_SQUARES = {'red': {'c1', 'g1', 'a3', 'e3', 'i3', 'c5', 'g5'},
+                    'black': {'c6', 'g6', 'a8', 'e8', 'i8', 'c10', 'g10'}}
+
+
+def to_square(col, row):
+    """Returns the algebraic square for a 0-based column and 1-based row, or None if it is off the board."""
+    if 0 <= col <= 8 and 1 <= row <= 10:
+        return chr(col + 97) + str(row)
+    return None
+
+
+def build_step_table(player, steps, allowed):
+    """Returns {square: {destination: blocking square or None}} for a piece that moves by fixed steps. Each step is
+    (d_col, d_row, block_col, block_row), with the block offset set to None when the step cannot be blocked."""
+    table = {}
+    for square in SQUARES:
+        col = ord(square[0]) - 97
+        row = int(square[1:])
+        destinations = {}
+        for d_col, d_row, b_col, b_row in steps(player, row):
+            destination = to_square(col + d_col, row + d_row)
+            if destination is not None and (allowed is None or destination in allowed[player]):
+                block = None if b_col is None else to_square(col + b_col, row + b_row)
+                destinations[destination] = block
+        table[square] = destinations
+    return table
+
+
+def general_steps(player, row):
+    """One space orthogonally."""
+    return [(1, 0, None, None), (-1, 0, None, None), (0, 1, None, None), (0, -1, None, None)]
+
+
+def advisor_steps(player, row):
+    """One space diagonally."""
+    return [(1, 1, None, None), (1, -1, None, None), (-1, 1, None, None), (-1, -1, None, None)]
+
+
+def elephant_steps(player, row):
+    """Two spaces diagonally, blocked by a piece on the Elephant's eye (the point in between)."""
+    return [(2, 2, 1, 1), (2, -2, 1, -1), (-2, 2, -1, 1), (-2, -2, -1, -1)]
+
+
+def horse_steps(player, row):
+    """One space orthogonally then one diagonally, blocked by a piece on the Horse's leg (the orthogonal point)."""
+    return [(1, 2, 0, 1), (-1, 2, 0, 1), (1, -2, 0, -1), (-1, -2, 0, -1),
+            (2, 1, 1, 0), (2, -1, 1, 0), (-2, 1, -1, 0), (-2, -1, -1, 0)]
+
+
+def soldier_steps(player, row):
+    """One space forward, plus one space sideways once the Soldier has crossed the river."""
+    if player == 'red':
+        steps = [(0, 1, None, None)]
+        crossed = row > 5
+    else:
+        steps = [(0, -1, None, None)]
+        crossed = row <= 5
+    if crossed:
+        steps += [(1, 0, None, None), (-1, 0, None, None)]
+    return steps
+
+
+def build_rays():
+    """Returns {square: [squares going up, down, right, left]}, each ordered outward from the square."""
+    rays = {}
+    for square in SQUARES:
+        col = ord(square[0]) - 97
+        row = int(square[1:])
+        rays[square] = [[to_square(col, r) for r in range(row + 1, 11)],
+                        [to_square(col, r) for r in range(row - 1, 0, -1)],
+                        [to_square(c, row) for c in range(col + 1, 9)],
+                        [to_square(c, row) for c in range(col - 1, -1, -1)]]
+    return rays
+
+
+# MOVE_TABLES[name][player][square] -> {destination: blocking square or None}
+MOVE_TABLES = {}
+for _name, _steps, _allowed in (('General', general_steps, PALACE), ('Advisor', advisor_steps, ADVISOR_SQUARES),
+                                ('Elephant', elephant_steps, ELEPHANT_SQUARES), ('Horse', horse_steps, None),
+                                ('Soldier', soldier_steps, None)):
+    MOVE_TABLES[_name] = {'red': build_step_table('red', _steps, _allowed),
+                          'black': build_step_table('black', _steps, _allowed)}
+
+# RAYS[square] -> the four lines a Chariot or Cannon slides along; LINE_SQUARES[square] -> all of them as a set.
+RAYS = build_rays()
+LINE_SQUARES = {}
+for _square in SQUARES:
+    LINE_SQUARES[_square] = set(RAYS[_square][0] + RAYS[_square][1] + RAYS[_square][2] + RAYS[_square][3])
+
+# Material values used by the search and by move ordering. The General can never really be captured, so its value
+# only matters when ordering captures.
+PIECE_VALUES = {'General': 10000, 'RChariot': 900, 'Cannon': 450, 'Horse': 400, 'Advisor': 200, 'Elephant': 200,
+                'Soldier': 100}
+
+
+def build_zobrist():
+    """Returns the Zobrist keys used to hash positions: {(player, name): {square: key}} and the key XORed in
+    when Black is to move. A fixed seed keeps hashes identical across runs and processes."""
+    rng = random.Random(20200312)
+    keys = {}
+    for player in ('red', 'black'):
+        for name in PIECE_VALUES:
+            keys[(player, name)] = {}
+            for square in SQUARES:
+                keys[(player, name)][square] = rng.getrandbits(63)
+    return keys, rng.getrandbits(63)
+
+
+ZOBRIST, ZOBRIST_BLACK_TO_MOVE = build_zobrist()
+
+
+# Marks a key that is not in a PositionCache, since False and [] are valid cached results.
+MISSING = object()
+
+
+class PositionCache:
+    """Remembers the results of position queries (check, checkmate, legal moves), keyed by position hash, query,
+    and player. Holds at most max_size results and evicts the least recently used one when full. A move changes
+    the position hash, so results for an earlier position are never returned for the new one."""
+
+    def __init__(self, max_size=4096):
+        """Initializes an empty cache holding at most max_size results (0 disables caching)."""
+        self.__entries = OrderedDict()
+        self.__max_size = max_size
+        self.__hits = 0
+        self.__misses = 0
+
+    def get(self, key):
+        """Returns the cached result for key, or MISSING"""
+        result = self.__entries.get(key, MISSING)
+        if result is MISSING:
+            self.__misses += 1
+        else:
+            self.__hits += 1
+            self.__entries.move_to_end(key)
+        return result
+
+    def put(self, key, result):
+        """Stores a result, evicting the least recently used one if the cache is full"""
+        if self.__max_size == 0:
+            return
+        self.__entries[key] = result
+        self.__entries.move_to_end(key)
+        if len(self.__entries) > self.__max_size:
+            self.__entries.popitem(last=False)
+
+    def clear(self):
+        """Empties the cache and resets the statistics"""
+        self.__entries.clear()
+        self.__hits = 0
+        self.__misses = 0
+
+    def get_stats(self):
+        """Returns the number of hits, misses, and stored results, and the hit rate"""
+        lookups = self.__hits + self.__misses
+        return {'hits': self.__hits, 'misses': self.__misses, 'size': len(self.__entries),
+                'max_size': self.__max_size, 'hit_rate': self.__hits / lookups if lookups else 0.0}
+
 
 class XiangqiGame:
     """Represents the game board. Can return the game state and determine if a specified player is in check.
     Also responsible for making moves."""
 
-    def __init__(self):
-        """Initializes the board, the pieces for both sides, the game state as UNFINISHED, and the turn count as 1."""
+    def __init__(self, verbose=True, cache_size=4096):
+        """Initializes the board, the pieces for both sides, the game state as UNFINISHED, and the turn count as 1.
+        With verbose set to False, make_move does not print messages or the board. Up to cache_size check and
+        legal move results are remembered per position."""
         # Rows are labeled 1-10 and Columns are labeled a-i
         # Row 1 is the red side and row 10 is the black side
 
@@ -121,10 +294,21 @@ class XiangqiGame:
         self.__board = [self.__row_1, self.__row_2, self.__row_3, self.__row_4, self.__row_5, self.__row_6,
                         self.__row_7, self.__row_8, self.__row_9, self.__row_10]
 
+        self.__verbose = verbose
+        self.__cache = PositionCache(cache_size)
+        self.__renderer = None
+
         # Game state starts as UNFINISHED and the turn_count starts as 1.
         self.__game_state = "UNFINISHED"
         self.__turn_counter = 1
 
+        # Zobrist hash of the position, kept up to date by set_piece and the turn counter.
+        self.__hash = 0
+        for row in self.__board:
+            for piece in row:
+                if piece is not None:
+                    self.__hash ^= ZOBRIST[(piece.get_player(), piece.get_name())][piece.get_location()]
+
     def get_game_state(self):
         """Returns the game state of the board; UNFINISHED, RED_WON, or BLACK_WON"""
         return self.__game_state
@@ -151,56 +335,299 @@ class XiangqiGame:
     def inc_turn_counter(self):
         """Increments the turn counter"""
         self.__turn_counter += 1
+        self.__hash ^= ZOBRIST_BLACK_TO_MOVE
+
+    def dec_turn_counter(self):
+        """Decrements the turn counter"""
+        self.__turn_counter -= 1
+        self.__hash ^= ZOBRIST_BLACK_TO_MOVE
+
+    def get_player_to_move(self):
+        """Returns 'red' or 'black', whichever player's turn it is"""
+        if self.__turn_counter % 2 == 1:
+            return 'red'
+        return 'black'
+
+    def get_hash(self):
+        """Returns the Zobrist hash of the position, including whose turn it is"""
+        return self.__hash
+
+    def get_cache(self):
+        """Returns the PositionCache used by is_in_check, is_checkmate, has_legal_move, and get_legal_moves"""
+        return self.__cache
+
+    def cached(self, query, player, compute):
+        """Returns the cached result of a query on the current position, computing and storing it if needed. Only
+        the public queries go through the cache; positions that are set up briefly to test a move call the
+        compute methods directly, so they do not push useful results out of it."""
+        key = (self.__hash, query, player)
+        result = self.__cache.get(key)
+        if result is MISSING:
+            result = compute(player)
+            self.__cache.put(key, result)
+        return result
+
+    def get_legal_moves(self, player):
+        """Returns a list of every legal (square_from, square_to) move for the specified player."""
+        return list(self.cached('legal_moves', player, self.compute_legal_moves))
+
+    def compute_legal_moves(self, player):
+        """Generates the legal moves for get_legal_moves."""
+        if self.is_in_check(player):
+            return self.get_evasions(player)
+        moves = []
+        for piece in self.get_pieces(player):
+            for square_to in self.get_candidate_squares(piece):
+                if self.is_legal_move(piece.get_location(), square_to):
+                    moves.append((piece.get_location(), square_to))
+        return moves
+
+    def do_move(self, square_from, square_to):
+        """Makes a move that is already known to be legal, without printing or updating the game state.
+        Returns an undo record to pass to undo_move."""
+        piece = self.get_piece(square_from)
+        captured = self.get_piece(square_to)
+        self.set_piece(None, square_from)
+        piece.set_location(square_to)
+        self.set_piece(piece, square_to)
+        self.inc_turn_counter()
+        return square_from, square_to, captured
+
+    def undo_move(self, record):
+        """Takes back a move made by do_move, using the undo record it returned."""
+        square_from, square_to, captured = record
+        piece = self.get_piece(square_to)
+        self.dec_turn_counter()
+        self.set_piece(piece, square_from)
+        piece.set_location(square_from)
+        self.set_piece(captured, square_to)
+
+    def get_snapshot(self):
+        """Returns the whole position as an immutable value for load_snapshot: every piece as
+        (location, player, name), the turn counter, and the game state."""
+        pieces = []
+        for row in self.get_board():
+            for piece in row:
+                if piece is not None:
+                    pieces.append((piece.get_location(), piece.get_player(), piece.get_name()))
+        return tuple(pieces), self.__turn_counter, self.__game_state
+
+    def load_snapshot(self, snapshot):
+        """Replaces the position with one returned by get_snapshot. New Piece objects are created, so pieces
+        (and undo records) from before the call no longer belong to the board."""
+        pieces, turn_counter, game_state = snapshot
+        for row in self.get_board():
+            for col in range(9):
+                row[col] = None
+        self.__hash = 0
+        for location, player, name in pieces:
+            piece = PIECE_CLASSES[name](player, location)
+            self.set_piece(piece, location)
+            if name == 'General' and player == 'red':
+                self.__r_g = piece
+            elif name == 'General':
+                self.__b_g = piece
+        self.__turn_counter = turn_counter
+        if turn_counter % 2 == 0:
+            self.__hash ^= ZOBRIST_BLACK_TO_MOVE
+        self.__game_state = game_state
 
     def is_checkmate(self, player):
-        """Determines if the specified player is in checkmate. Checks if the player's General has any legal moves."""
-        # Variables for the General's location, row, and col.
+        """Determines if the specified player is in checkmate. The player must be in check and have no evasions."""
+        return self.cached('checkmate', player, self.compute_checkmate)
+
+    def compute_checkmate(self, player):
+        """Searches the evasions for is_checkmate."""
+        return self.is_in_check(player) and len(self.get_evasions(player)) == 0
+
+    def is_stalemate(self, player):
+        """Determines if the specified player is stalemated; not in check, but without a single legal move."""
+        return not self.is_in_check(player) and not self.has_legal_move(player)
+
+    def has_legal_move(self, player):
+        """Returns True if the specified player has at least one legal move, otherwise returns False."""
+        return self.cached('has_legal_move', player, self.compute_has_legal_move)
+
+    def compute_has_legal_move(self, player):
+        """Returns True as soon as any legal move is found for has_legal_move."""
+        if self.is_in_check(player):
+            return len(self.get_evasions(player)) != 0
+        for piece in self.get_pieces(player):
+            for square_to in self.get_candidate_squares(piece):
+                if self.is_legal_move(piece.get_location(), square_to):
+                    return True
+        return False
+
+    def get_attackers(self, square, player):
+        """Returns the specified player's pieces that can legally capture on square, least valuable first."""
+        attackers = []
+        for piece in self.get_pieces(player):
+            if piece.can_move(square) and self.is_legal_move(piece.get_location(), square):
+                attackers.append(piece)
+        attackers.sort(key=lambda attacker: PIECE_VALUES[attacker.get_name()])
+        return attackers
+
+    def see(self, square_from, square_to):
+        """Static exchange evaluation. Returns the material the mover expects to win by moving the piece at
+        square_from to square_to when both sides keep recapturing on square_to with their least valuable piece,
+        and either side may stop once recapturing would lose material.
+
+        The captures are really made on the board (and undone afterwards), so every recapture is a legal move:
+        Cannon screens that appear or disappear, blocked Horse legs, pins, and the facing Generals rule are all
+        taken into account."""
+        target = self.get_piece(square_to)
+        current = self.get_piece(square_from)
+        gain = [PIECE_VALUES[target.get_name()] if target is not None else 0]
+        records = [self.do_move(square_from, square_to)]
+        depth = 0
+        try:
+            while True:
+                # Speculative score for the side to move, if it recaptures the piece that just moved in.
+                depth += 1
+                gain.append(PIECE_VALUES[current.get_name()] - gain[depth - 1])
+                if max(-gain[depth - 1], gain[depth]) < 0:
+                    break
+                attackers = self.get_attackers(square_to, 'black' if current.get_player() == 'red' else 'red')
+                if len(attackers) == 0:
+                    break
+                current = attackers[0]
+                records.append(self.do_move(current.get_location(), square_to))
+        finally:
+            for record in reversed(records):
+                self.undo_move(record)
+
+        # Each side chooses between recapturing and standing pat, from the last capture back to the first.
+        while depth > 1:
+            depth -= 1
+            gain[depth - 1] = -max(-gain[depth - 1], gain[depth])
+        return gain[0]
+
+    def get_pieces(self, player):
+        """Returns a list of the specified player's pieces still on the board."""
+        pieces = []
+        for row in self.get_board():
+            for piece in row:
+                if piece is not None and piece.get_player() == player:
+                    pieces.append(piece)
+        return pieces
+
+    def get_checkers(self, player):
+        """Returns a list of the enemy pieces that are attacking the specified player's General."""
         g_loc = self.get_general(player).get_location()
-        g_row = int(g_loc[1:])
-        g_col = ord(g_loc[0])
-
-        # The four directions a General can move in any given position
-        g_w = chr(g_col - 1) + str(g_row)  # west
-        g_e = chr(g_col + 1) + str(g_row)  # east
-        g_s = chr(g_col) + str(g_row + 1)  # south
-        g_n = chr(g_col) + str(g_row - 1)  # north
-
-        # List of possible moves and a flag to determine if the General is still in check.
-        possible_moves = [g_n, g_s, g_e, g_w]
-        in_check = True
-
-        # From the possible moves, if the general can move there and not be in check, return False.
-        for loc in possible_moves:
-            if self.get_general(player).can_move(loc):
-                if self.get_piece(loc) is not None:
-                    temp_piece = self.get_piece(loc)
-                elif self.get_piece(loc) is None:
-                    temp_piece = None
-
-                # Make the move temporarily
-                self.set_piece(None, g_loc)
-                self.get_general(player).set_location(loc)
-                self.set_piece(self.get_general(player), loc)
-
-                # Determine if the move places the player in check
-                if not self.is_in_check(player):
-                    in_check = False
-
-                # Undo the move and return the results
-                self.set_piece(self.get_general(player), g_loc)
-                self.get_general(player).set_location(g_loc)
-                self.set_piece(temp_piece, loc)
-
-            if in_check is False:
-                return False
-        if in_check is True:
-            return True
+        checkers = []
+        for row in self.get_board():
+            for piece in row:
+                if piece is not None and piece.get_player() != player:
+                    if self.get_move_error(piece.get_location(), g_loc) is None:
+                        checkers.append(piece)
+        return checkers
+
+    def get_block_squares(self, checker, square_to):
+        """Returns the squares that a piece can move onto to stop the checker from reaching square_to: the
+        checker's own square (capture), plus the squares between them on a line or the Horse's leg (interposition).
+        """
+        square_from = checker.get_location()
+        squares = {square_from}
+
+        # Chariot and Cannon: every square strictly between the checker and the General.
+        if checker.get_name() in ('RChariot', 'Cannon'):
+            squares.update(self.get_squares_between(square_from, square_to))
+
+        # Horse: the leg square recorded in the move table.
+        if checker.get_name() == 'Horse':
+            squares.add(MOVE_TABLES['Horse'][checker.get_player()][square_from][square_to])
+        return squares
+
+    def get_evasions(self, player):
+        """Returns a list of (square_from, square_to) moves that get the specified player out of check: General
+        steps, captures of the checker, interpositions, and moving a Cannon's screen out of the line of attack.
+        Returns an empty list if the player is not in check."""
+        checkers = self.get_checkers(player)
+        if len(checkers) == 0:
+            return []
+        general = self.get_general(player)
+        g_loc = general.get_location()
+
+        # For each checker, the squares that stop it when landed on, and the friendly screen (if any) that stops it
+        # by leaving. A Cannon's screen can be any piece, but only our own can be moved this turn.
+        block_sets = []
+        screens = []
+        for checker in checkers:
+            block_sets.append(self.get_block_squares(checker, g_loc))
+            screen = None
+            if checker.get_name() == 'Cannon':
+                for square in self.get_squares_between(checker.get_location(), g_loc):
+                    if self.get_piece(square) is not None and self.get_piece(square).get_player() == player:
+                        screen = square
+            screens.append(screen)
+
+        # The General may step anywhere; every other piece must answer every checker at once.
+        candidates = []
+        for square_to in self.get_candidate_squares(general):
+            candidates.append((g_loc, square_to))
+        for piece in self.get_pieces(player):
+            if piece is general:
+                continue
+            loc = piece.get_location()
+            targets = None
+            for index in range(len(checkers)):
+                if screens[index] == loc:
+                    continue
+                if targets is None:
+                    targets = set(block_sets[index])
+                else:
+                    targets &= block_sets[index]
+            if targets is None:
+                # The piece screens every checker, so any of its moves may resolve the check.
+                for square_to in self.get_candidate_squares(piece):
+                    candidates.append((loc, square_to))
+            else:
+                for square_to in targets:
+                    candidates.append((loc, square_to))
+
+        # Keep only the candidates that are legal and actually leave the General out of check.
+        evasions = []
+        for square_from, square_to in candidates:
+            if self.is_legal_move(square_from, square_to):
+                evasions.append((square_from, square_to))
+        return evasions
+
+    def get_candidate_squares(self, piece):
+        """Returns the squares the piece could move to if nothing were in its way."""
+        loc = piece.get_location()
+
+        # Chariots and Cannons can reach any square in their row or column.
+        if piece.get_name() in ('RChariot', 'Cannon'):
+            return list(LINE_SQUARES[loc])
+        return list(MOVE_TABLES[piece.get_name()][piece.get_player()][loc])
+
+    def is_legal_move(self, square_from, square_to):
+        """Determines if the piece at square_from can legally move to square_to without printing anything. The move
+        is made temporarily to see if it leaves the mover's General in check."""
+        if self.get_move_error(square_from, square_to) is not None:
+            return False
+        piece = self.get_piece(square_from)
+        captured = self.get_piece(square_to)
+
+        # Make the move temporarily
+        self.set_piece(None, square_from)
+        piece.set_location(square_to)
+        self.set_piece(piece, square_to)
+
+        in_check = self.compute_in_check(piece.get_player())
+
+        # Undo the move and return the results
+        self.set_piece(piece, square_from)
+        piece.set_location(square_from)
+        self.set_piece(captured, square_to)
+        return not in_check
 
     def is_in_check(self, player):
         """Returns True if the specified player is in check, otherwise returns False"""
-        # Temp piece to test valid locations
-        temp = Piece('temp', 'temp', 'temp')
+        return self.cached('in_check', player, self.compute_in_check)
 
+    def compute_in_check(self, player):
+        """Looks for every way the specified player's General can be attacked, for is_in_check"""
         # Variables for the specified General's location, row, and col.
         g_loc = self.get_general(player).get_location()
         g_row = int(g_loc[1:])  # integer representing row
@@ -224,49 +651,24 @@ class XiangqiGame:
             if counter == 0:
                 return True
 
-        # Soldier: Orthogonally checks for Soldiers around the General, depending on location and side.
-        s_left = chr(g_col - 1) + str(g_row)
-        s_right = chr(g_col + 1) + str(g_row)
-        s_below = chr(g_col) + str(g_row + 1)
-        s_above = chr(g_col) + str(g_row - 1)
-
-        # Each case checks if the given piece at each location is a Soldier and if they belong to the player.
-        if self.get_piece(s_left) is not None:
-            if self.get_piece(s_left).get_name() == 'Soldier' and self.get_piece(s_left).get_player() != player:
-                return True
-        if self.get_piece(s_right) is not None:
-            if self.get_piece(s_right).get_name() == 'Soldier' and self.get_piece(s_right).get_player() != player:
-                return True
-        if player == 'red' and self.get_piece(s_below) is not None:
-            if self.get_piece(s_below).get_name() == 'Soldier' and self.get_piece(s_below).get_player() != player:
-                return True  # in check
-        if player == 'black' and self.get_piece(s_above) is not None:
-            if self.get_piece(s_above).get_name() == 'Soldier' and self.get_piece(s_above).get_player() != player:
-                return True
+        # Soldier: Checks the squares next to the General for an enemy Soldier that can step onto it.
+        enemy = 'black' if player == 'red' else 'red'
+        for ray in RAYS[g_loc]:
+            if len(ray) == 0:
+                continue
+            square = ray[0]
+            piece = self.get_piece(square)
+            if piece is not None and piece.get_name() == 'Soldier' and piece.get_player() != player:
+                if g_loc in MOVE_TABLES['Soldier'][enemy][square]:
+                    return True
 
-        # Horse: Checks the 8 possible ways a Horse can put a General in check.
-        h_1 = chr(g_col + 1) + str(g_row + 2)
-        h_2 = chr(g_col + 1) + str(g_row - 2)
-        h_3 = chr(g_col + 2) + str(g_row + 1)
-        h_4 = chr(g_col + 2) + str(g_row - 1)
-        h_5 = chr(g_col - 1) + str(g_row + 2)
-        h_6 = chr(g_col - 1) + str(g_row - 2)
-        h_7 = chr(g_col - 2) + str(g_row + 1)
-        h_8 = chr(g_col - 2) + str(g_row - 1)
-
-        # Two lists; one of possible locations, one of actual locations on the board
-        pos_h = [h_1, h_2, h_3, h_4, h_5, h_6, h_7, h_8]
-        test_h = []
-        # For each possible location, if it is on the board, add it to test_h
-        for h in pos_h:
-            if temp.can_move(h):
-                test_h.append(h)
-        # For each board location, if there is a Horse, check if the Horse is an enemy and if it can reach the General.
-        for h in test_h:
-            if self.get_piece(h) is not None:
-                if self.get_piece(h).get_name() == 'Horse' and self.get_piece(h).get_player() != player:
-                    if self.is_horse_blocked(self.get_piece(h), g_loc) is False:
-                        return True
+        # Horse: Horse moves are symmetric, so the Horses that could reach the General are on the squares the
+        # General's own square would reach as a Horse. The leg is looked up from the Horse's side.
+        for square in MOVE_TABLES['Horse'][player][g_loc]:
+            piece = self.get_piece(square)
+            if piece is not None and piece.get_name() == 'Horse' and piece.get_player() != player:
+                if self.get_piece(MOVE_TABLES['Horse'][enemy][square][g_loc]) is None:
+                    return True
 
         # Chariot: Checks if there is a Chariot in the same row/col as the General, and if there are any pieces
         # between them.
@@ -309,7 +711,7 @@ class XiangqiGame:
                         if counter == 0:
                             return True
                     elif p_col > g_col - 97:
-                        temp = r_row[g_col - 97:p_col - 1]
+                        temp = r_row[g_col - 97 + 1:p_col]
                         counter = 0
                         for item in temp:
                             if item is not None:
@@ -346,7 +748,7 @@ class XiangqiGame:
                 if piece.get_name() == 'Cannon' and piece.get_player() != player:
                     p_col = ord(piece.get_location()[0]) - 97
                     if p_col < g_col - 97:
-                        temp = r_row[p_col:g_col - 97 - 1]
+                        temp = r_row[p_col + 1:g_col - 97]
                         counter = 0
                         for item in temp:
                             if item is not None:
@@ -354,7 +756,7 @@ class XiangqiGame:
                         if counter == 1:  # if only a single piece, Cannon put General in check.
                             return True
                     elif p_col > g_col - 97:
-                        temp = r_row[g_col - 97:p_col - 1]
+                        temp = r_row[g_col - 97 + 1:p_col]
                         counter = 0
                         for item in temp:
                             if item is not None:
@@ -363,277 +765,212 @@ class XiangqiGame:
                             return True
         return False
 
-    def is_horse_blocked(self, horse, square_to):
-        """Determines if a Horse in the 8 possible check locations around a General is blocked by another piece."""
-        square_from = horse.get_location()
-        if horse.can_move(square_to):
-            # Variables to convert each row/col into their respective integers
-            row_to = int(square_to[1:])
-            col_to = ord((square_to[0])) - 97
-            row_from = int(square_from[1:])
-            col_from = ord(square_from[0]) - 97
-
-            # Case 1: If desired move is up 2 and left/right one, check horse' NORTH
-            if row_to - row_from == -2 and abs(col_from - col_to) == 1:
-                temp = chr(col_from + 97) + str(row_from - 1)
-                if self.get_piece(temp) is not None:
-                    return True
+    def get_move_error(self, square_from, square_to):
+        """Determines if the piece at square_from can reach square_to, ignoring turn order and check. Returns None
+        if the move is possible, otherwise returns a message explaining why the move is invalid."""
+        # Squares off the board are rejected before they are looked up; 'a0' would wrap around to row 10.
+        for square in (square_from, square_to):
+            if square not in BOARD_SQUARES:
+                return "Invalid move - " + str(square) + " is not a square on the board."
 
-            # Case 2: If desired move is down 2 and left/right one, check horse' SOUTH
-            if row_to - row_from == 2 and abs(col_from - col_to) == 1:
-                temp = chr(col_from + 97) + str(row_from + 1)
-                if self.get_piece(temp) is not None:
-                    return True
+        # Variables for the pieces at square_from and square_to (if any, or if None)
+        p1 = self.get_piece(square_from)
+        p2 = self.get_piece(square_to)
 
-            # Case 3: If desired move is right 2 and up/down one, check horse' EAST
-            if abs(row_to - row_from) == 1 and col_to - col_from == 2:
-                temp = chr(col_from + 97 + 1) + str(row_from)
-                if self.get_piece(temp) is not None:
-                    return True
+        # There is no piece at square_from; invalid move
+        if p1 is None:
+            return "There is no piece at " + square_from + '. Invalid move.'
+
+        # If the square_to does not exist on the board, or the piece cannot move that way
+        if not p1.can_move(square_to):
+            return "Invalid move - " + p1.get_player()[0].upper() + p1.get_player()[
+                                                                    1:] + ' ' + p1.get_name() + " at " + square_from + " cannot move to " + square_to
+
+        # Checks if the Horse is blocked on its leg, in the direction of square_to
+        if p1.get_name() == 'Horse':
+            leg = MOVE_TABLES['Horse'][p1.get_player()][square_from][square_to]
+            if self.get_piece(leg) is not None:
+                if int(leg[1:]) < int(square_from[1:]):
+                    direction = 'NORTH'
+                elif int(leg[1:]) > int(square_from[1:]):
+                    direction = 'SOUTH'
+                elif leg[0] > square_from[0]:
+                    direction = 'EAST'
+                else:
+                    direction = 'WEST'
+                return "Invalid move! Horse is blocked to the " + direction + "."
 
-            # Case 4: If desired move is left 2 and up/down one, check horse' WEST
-            if abs(row_to - row_from) == 1 and col_to - col_from == -2:
-                temp = chr(col_from + 97 - 1) + str(row_from)
-                if self.get_piece(temp) is not None:
-                    return True
-        return False
+        # Checks if the Elephant is blocked on its eye
+        if p1.get_name() == 'Elephant':
+            if self.get_piece(MOVE_TABLES['Elephant'][p1.get_player()][square_from][square_to]) is not None:
+                return "Invalid move! Elephant is blocked."
+
+        # Checks if the Chariot is blocked
+        if p1.get_name() == 'RChariot':
+            if self.count_between(square_from, square_to) != 0:
+                return "Invalid move! Chariot is blocked."
+
+        # Checks if the Cannon has something to capture and/or if there is a piece to jump over.
+        if p1.get_name() == 'Cannon':
+            counter = self.count_between(square_from, square_to)
+            if counter != 0 and p2 is None:
+                return "Invalid move! Cannon is blocked with nothing to capture."
+            if counter != 1 and p2 is not None:
+                return "Invalid move! Cannon does not have a single piece to jump over."
+
+        # Cannot capture your own pieces
+        if p2 is not None and p1.get_player() == p2.get_player():
+            return "Invalid move - cannot capture own piece!"
+
+        return None
 
     def make_move(self, square_from, square_to):
         """Determines if the desired move can be made. If so, move is made, game_state is updated, and returns True.
          Else, if the move is invalid, or if the game has already been won, returns False"""
-        # Variables for the pieces at square_from and square_to (if any, or if None)
-        p1 = self.get_piece(square_from)
-        p2 = self.get_piece(square_to)
-
         # Red or Black has already won
         if self.get_game_state() != 'UNFINISHED':
-            print("Game has already finished. " + self.get_game_state() + '.')
+            self.report("Game has already finished. " + self.get_game_state() + '.')
             return False
 
+        # Squares off the board are rejected before they are looked up; 'a0' would wrap around to row 10.
+        for square in (square_from, square_to):
+            if square not in BOARD_SQUARES:
+                self.report("Invalid move - " + str(square) + " is not a square on the board.")
+                return False
+
+        # Variables for the pieces at square_from and square_to (if any, or if None)
+        p1 = self.get_piece(square_from)
+        p2 = self.get_piece(square_to)
+
         # There is no piece at square_from; invalid move
         if p1 is None:
-            print("There is no piece at " + square_from + '. Invalid move.')
+            self.report("There is no piece at " + square_from + '. Invalid move.')
             return False
 
         # Red has every odd turn (1,3,5..), check to see which player's piece is at square_from
         if self.get_turn_counter() % 2 == 1 and p1.get_player() == 'black':
-            print("Invalid move - it is not Black's turn!")
+            self.report("Invalid move - it is not Black's turn!")
             return False
         # Black has every even turn (2,4,6..), check to see which player's piece is at square_from
         if self.get_turn_counter() % 2 == 0 and p1.get_player() == 'red':
-            print("Invalid move - it is not Red's turn!")
+            self.report("Invalid move - it is not Red's turn!")
             return False
 
-        # If the square_to exists on the board
-        if p1.can_move(square_to):
-            row_to = int(square_to[1:])
-            col_to = ord((square_to[0])) - 97
-            row_from = int(square_from[1:])
-            col_from = ord(square_from[0]) - 97
-
-            # Checks if the Horse is blocked in the direction of square_to
-            if p1.get_name() == 'Horse':
-                # Case 1: If desired move is down 2 and left/right one, check horse' NORTH works
-                if row_to - row_from == -2 and abs(col_from - col_to) == 1:
-                    temp = chr(col_from + 97) + str(row_from - 1)
-                    if self.get_piece(temp) is not None:
-                        print("Invalid move! Horse is blocked to the NORTH.")
-                        self.print_board()
-                        return False
-
-                # Case 2: If desired move is up 2 and left/right one, check horse' SOUTH
-                if row_to - row_from == 2 and abs(col_from - col_to) == 1:
-                    temp = chr(col_from + 97) + str(row_from + 1)
-                    if self.get_piece(temp) is not None:
-                        print("Invalid move! Horse is blocked to the SOUTH.")
-                        self.print_board()
-                        return False
-
-                # Case 3: If desired move is right 2 and up/down one, check horse' EAST works
-                if abs(row_to - row_from) == 1 and col_to - col_from == 2:
-                    temp = chr(col_from + 97 + 1) + str(row_from)
-                    if self.get_piece(temp) is not None:
-                        print("Invalid move! Horse is blocked to the EAST.")
-                        self.print_board()
-                        return False
-
-                # Case 4: If desired move is left 2 and up/down one, check horse' WEST
-                if abs(row_to - row_from) == 1 and col_to - col_from == -2:
-                    temp = chr(col_from + 97 - 1) + str(row_from)
-                    if self.get_piece(temp) is not None:
-                        print("Invalid move! Horse is blocked to the WEST.")
-                        self.print_board()
-                        return False
-
-            # Checks if the Elephant is blocked
-            if p1.get_name() == 'Elephant':
-                temp = chr(int((col_from + col_to) / 2) + 97) + str(int((row_from + row_to) / 2))
-                if self.get_piece(temp) is not None:
-                    print("Invalid move! Elephant is blocked.")
-                    self.print_board()
-                    return False
-
-            # Checks if the Chariot is blocked
-            if p1.get_name() == 'RChariot':
-                # Vertical Movement
-                if col_from == col_to:
-                    counter = 0
-                    if row_to > row_from:
-                        r_col = self.get_col(square_from[0])[row_from:row_to - 1]
-                    if row_to < row_from:
-                        r_col = self.get_col(square_from[0])[row_to:row_from - 1]
-                    for piece in r_col:
-                        if piece is not None:
-                            counter += 1
-                    if counter != 0:
-                        print("Invalid move! Chariot is blocked.")
-                        self.print_board()
-                        return False
-                # Horizontal Movement
-                if row_from == row_to:
-                    counter = 0
-                    if col_to > col_from:
-                        r_row = self.get_board()[row_to - 1][col_from + 1:col_to]
-                    if col_to < col_from:
-                        r_row = self.get_board()[row_to - 1][col_to + 1:col_from]
-                    for piece in r_row:
-                        if piece is not None:
-                            counter += 1
-                    if counter != 0:
-                        print("Invalid move! Chariot is blocked.")
-                        self.print_board()
-                        return False
-
-            # Checks if the Cannon has something to capture and/or if there is a piece to jump over.
-            if p1.get_name() == 'Cannon':
-                # Vertical Movement
-                if col_from == col_to:
-                    counter = 0
-                    if row_to > row_from:
-                        r_col = self.get_col(square_from[0])[row_from:row_to - 1]
-                    if row_to < row_from:
-                        r_col = self.get_col(square_from[0])[row_to:row_from - 1]
-                    for piece in r_col:
-                        if piece is not None:
-                            counter += 1
-                    if counter == 1 and p2 is None:
-                        print("Invalid move! Cannon is blocked with nothing to capture.")
-                        self.print_board()
-                        return False
-                    if counter != 1 and p2 is not None:
-                        print("Invalid move! Cannon does not have a single piece to jump over.")
-                        self.print_board()
-                        return False
-
-                # Horizontal Movement
-                if row_from == row_to:
-                    counter = 0
-                    if col_to > col_from:
-                        r_row = self.get_board()[row_to - 1][col_from + 1:col_to]
-                    if col_to < col_from:
-                        r_row = self.get_board()[row_to - 1][col_to + 1:col_from]
-                    for piece in r_row:
-                        if piece is not None:
-                            counter += 1
-                    if counter == 1 and p2 is None:
-                        print("Invalid move! Cannon is blocked with nothing to capture.")
-                        self.print_board()
-                        return False
-                    if counter != 1 and p2 is not None:
-                        print("Invalid move! Cannon does not have a single piece to jump over.")
-                        self.print_board()
-                        return False
-
-            # If square_to is empty or if piece at square_to is the enemy
-            if p2 is None or p1.get_player() != p2.get_player():
-                # Move to the new location or capture the enemy at the new location
-                self.set_piece(None, square_from)
-                p1.set_location(square_to)
-                self.set_piece(p1, square_to)
-                # If this move puts you in check, revert the move and return False.
-                if self.get_turn_counter() % 2 == 1 and self.is_in_check('red'):
-                    self.set_piece(p1, square_from)
-                    p1.set_location(square_from)
-                    self.set_piece(p2, square_to)
-                    print("Invalid move - Red is in check or move puts Red in check!")
-                    self.print_board()
-                    return False
-                # If this move puts you in check, revert the move and return False.
-                if self.get_turn_counter() % 2 == 0 and self.is_in_check('black'):
-                    self.set_piece(p1, square_from)
-                    p1.set_location(square_from)
-                    self.set_piece(p2, square_to)
-                    print("Invalid move - Black is in check or move puts Black in check!")
-                    self.print_board()
-                    return False
-
-                # Print statements for moving and/or checking
-                if p2 is None:
-                    if self.get_turn_counter() % 2 == 0 and self.is_in_check('red'):  # black turn and red in check
-                        print(p1.get_player()[0].upper() + p1.get_player()[
-                                                           1:] + ' ' + p1.get_name() + ' at ' + square_from + ' moves to ' + square_to + ' and puts the Red General in check!')
-                    elif self.get_turn_counter() % 2 == 1 and self.is_in_check('black'):  # red turn and black in check
-                        print(p1.get_player()[0].upper() + p1.get_player()[
-                                                           1:] + ' ' + p1.get_name() + ' at ' + square_from + ' moves to ' + square_to + ' and puts the Black General in check!')
-                    else:
-                        print(p1.get_player()[0].upper() + p1.get_player()[
-                                                           1:] + ' ' + p1.get_name() + ' at ' + square_from + ' moves to ' + square_to + '.')
-
-                # Print statements for capturing and/or checking
-                if p2 is not None:
-                    if self.get_turn_counter() % 2 == 0 and self.is_in_check('red'):  # black turn and red in check
-                        print(p1.get_player()[0].upper() + p1.get_player()[
-                                                           1:] + ' ' + p1.get_name() + ' at ' + square_from + ' captures ' +
-                              p2.get_player()[0].upper() + p2.get_player()[
-                                                           1:] + ' ' + p2.get_name() + ' at ' + square_to + ' and puts the Red General in check!')
-                    elif self.get_turn_counter() % 2 == 1 and self.is_in_check('black'):  # red turn and black in check
-                        print(p1.get_player()[0].upper() + p1.get_player()[
-                                                           1:] + ' ' + p1.get_name() + ' at ' + square_from + ' captures ' +
-                              p2.get_player()[0].upper() + p2.get_player()[
-                                                           1:] + ' ' + p2.get_name() + ' at ' + square_to + ' and puts the Black General in check!')
-                    else:
-                        print(p1.get_player()[0].upper() + p1.get_player()[
-                                                           1:] + ' ' + p1.get_name() + ' at ' + square_from + ' captures ' +
-                              p2.get_player()[0].upper() + p2.get_player()[
-                                                           1:] + ' ' + p2.get_name() + ' at ' + square_to + '.')
-
-                # Increment the turn and print the board.
-                self.inc_turn_counter()  # turn has been made, increment the turn to the next player
-                self.print_board()
-
-                # If any moves lead to check mate, game is over.
-                if self.is_checkmate('red'):
-                    self.set_game_state("BLACK_WON")
-                    print("Red has no more legal moves; CHECKMATE - BLACK WINS!")
-                    return False
-                if self.is_checkmate('black'):
-                    self.set_game_state("RED_WON")
-                    print("Black has no more legal moves; CHECKMATE - RED WINS!")
-                    return False
+        # The piece cannot reach square_to, is blocked, or would capture its own side
+        error = self.get_move_error(square_from, square_to)
+        if error is not None:
+            self.report(error)
+            self.report_board()
+            return False
 
-                return True
-            elif self.get_game_state() == 'UNFINISHED':
-                print("Invalid move - cannot capture own piece!")
-                self.print_board()
-                return False
+        # Move to the new location or capture the enemy at the new location
+        self.set_piece(None, square_from)
+        p1.set_location(square_to)
+        self.set_piece(p1, square_to)
+        # If this move puts you in check, revert the move and return False.
+        if self.get_turn_counter() % 2 == 1 and self.compute_in_check('red'):
+            self.set_piece(p1, square_from)
+            p1.set_location(square_from)
+            self.set_piece(p2, square_to)
+            self.report("Invalid move - Red is in check or move puts Red in check!")
+            self.report_board()
+            return False
+        # If this move puts you in check, revert the move and return False.
+        if self.get_turn_counter() % 2 == 0 and self.compute_in_check('black'):
+            self.set_piece(p1, square_from)
+            p1.set_location(square_from)
+            self.set_piece(p2, square_to)
+            self.report("Invalid move - Black is in check or move puts Black in check!")
+            self.report_board()
+            return False
 
+        # The move is legal, so the turn passes. Whether it gives check is then asked of the real position, which
+        # the checkmate and stalemate tests below reuse from the cache.
+        self.inc_turn_counter()  # turn has been made, increment the turn to the next player
+        red_in_check = self.get_turn_counter() % 2 == 1 and self.is_in_check('red')
+        black_in_check = self.get_turn_counter() % 2 == 0 and self.is_in_check('black')
+
+        # Print statements for moving and/or checking
+        if p2 is None:
+            if red_in_check:  # black moved and red in check
+                self.report(p1.get_player()[0].upper() + p1.get_player()[
+                                                         1:] + ' ' + p1.get_name() + ' at ' + square_from + ' moves to ' + square_to + ' and puts the Red General in check!')
+            elif black_in_check:  # red moved and black in check
+                self.report(p1.get_player()[0].upper() + p1.get_player()[
+                                                         1:] + ' ' + p1.get_name() + ' at ' + square_from + ' moves to ' + square_to + ' and puts the Black General in check!')
+            else:
+                self.report(p1.get_player()[0].upper() + p1.get_player()[
+                                                         1:] + ' ' + p1.get_name() + ' at ' + square_from + ' moves to ' + square_to + '.')
+
+        # Print statements for capturing and/or checking
+        if p2 is not None:
+            if red_in_check:  # black moved and red in check
+                self.report(p1.get_player()[0].upper() + p1.get_player()[
+                                                         1:] + ' ' + p1.get_name() + ' at ' + square_from + ' captures ' +
+                            p2.get_player()[0].upper() + p2.get_player()[
+                                                         1:] + ' ' + p2.get_name() + ' at ' + square_to + ' and puts the Red General in check!')
+            elif black_in_check:  # red moved and black in check
+                self.report(p1.get_player()[0].upper() + p1.get_player()[
+                                                         1:] + ' ' + p1.get_name() + ' at ' + square_from + ' captures ' +
+                            p2.get_player()[0].upper() + p2.get_player()[
+                                                         1:] + ' ' + p2.get_name() + ' at ' + square_to + ' and puts the Black General in check!')
+            else:
+                self.report(p1.get_player()[0].upper() + p1.get_player()[
+                                                         1:] + ' ' + p1.get_name() + ' at ' + square_from + ' captures ' +
+                            p2.get_player()[0].upper() + p2.get_player()[
+                                                         1:] + ' ' + p2.get_name() + ' at ' + square_to + '.')
+
+        # Print the board.
+        self.report_board()
+
+        # Only the player who moves next can have been checkmated or stalemated by this move.
+        if self.get_turn_counter() % 2 == 1:
+            player, winner = 'red', 'BLACK'
         else:
-            print("Invalid move - " + p1.get_player()[0].upper() + p1.get_player()[
-                                                                   1:] + ' ' + p1.get_name() + " at " + square_from + " cannot move to " + square_to)
+            player, winner = 'black', 'RED'
+
+        # In check with no evasions is checkmate. Xiangqi has no draw by stalemate; the stalemated player loses.
+        if self.is_checkmate(player):
+            self.set_game_state(winner + "_WON")
+            self.report(player.capitalize() + " has no more legal moves; CHECKMATE - " + winner + " WINS!")
+        elif self.is_stalemate(player):
+            self.set_game_state(winner + "_WON")
+            self.report(player.capitalize() + " has no more legal moves; STALEMATE - " + winner + " WINS!")
+
+        return True
+
+    def report(self, message):
+        """Prints a message about a move, unless the game was created with verbose set to False. With a renderer
+        set, the message is shown below the drawn board instead, since printing would write over it."""
+        if self.__renderer is not None:
+            self.__renderer.show_message(message)
+        elif self.__verbose:
+            print(message)
+
+    def set_renderer(self, renderer):
+        """Draws the board with a renderer (see render.py) after each move instead of print_board, and shows move
+        messages with its show_message. The renderer only redraws squares that changed, so rejected moves draw
+        nothing but their message. None goes back to print_board."""
+        self.__renderer = renderer
+
+    def report_board(self):
+        """Draws the board after a move with the renderer if one is set, otherwise prints it unless the game was
+        created with verbose set to False"""
+        if self.__renderer is not None:
+            self.__renderer.render(self)
+        elif self.__verbose:
             self.print_board()
-            return False
 
     def print_board(self):
         """Prints the game board"""
         for row in self.get_board():
-            temp = '['
+            cells = []
             for piece in row:
                 if piece is None:
-                    temp += "    ,"
+                    cells.append("    ,")
                 else:
-
-                    temp += ' ' + (piece.get_player()[0] + piece.get_name()[0]) + ', '
-            print(temp + ']')
+                    cells.append(' ' + piece.get_abbreviation() + ', ')
+            print('[' + ''.join(cells) + ']')
         temp = self.get_turn_counter()
         if temp % 2 == 1:
             print("Red's turn")
@@ -649,6 +986,29 @@ class XiangqiGame:
             temp_col.append(row[ord(col) - 97])
         return temp_col
 
+    def get_squares_between(self, square_from, square_to):
+        """Returns the squares strictly between two squares in the same row or column."""
+        row_from = int(square_from[1:])
+        col_from = ord(square_from[0]) - 97
+        row_to = int(square_to[1:])
+        col_to = ord(square_to[0]) - 97
+        squares = []
+        if col_from == col_to:
+            for r in range(min(row_from, row_to) + 1, max(row_from, row_to)):
+                squares.append(square_from[0] + str(r))
+        elif row_from == row_to:
+            for c in range(min(col_from, col_to) + 1, max(col_from, col_to)):
+                squares.append(chr(c + 97) + str(row_from))
+        return squares
+
+    def count_between(self, square_from, square_to):
+        """Returns the number of pieces strictly between two squares in the same row or column."""
+        counter = 0
+        for square in self.get_squares_between(square_from, square_to):
+            if self.get_piece(square) is not None:
+                counter += 1
+        return counter
+
     def get_piece(self, location):
         """Returns the piece at the specified location"""
         row = int(location[1:])
@@ -658,10 +1018,15 @@ class XiangqiGame:
         return board[row - 1][ord(col) - 97]
 
     def set_piece(self, piece, location):
-        """Sets the piece at the specified location"""
+        """Sets the piece at the specified location, updating the position hash"""
         row = int(location[1:])
         col = location[0]
         board = self.get_board()
+        old_piece = board[row - 1][ord(col) - 97]
+        if old_piece is not None:
+            self.__hash ^= ZOBRIST[(old_piece.get_player(), old_piece.get_name())][location]
+        if piece is not None:
+            self.__hash ^= ZOBRIST[(piece.get_player(), piece.get_name())][location]
         board[row - 1][ord(col) - 97] = piece
 
 
@@ -676,6 +1041,8 @@ class Piece:
         self.__name = name
         # Location on board via algebraic notation
         self.__location = location
+        # Two letters used when printing the board, e.g. 'rH' for a Red Horse
+        self.__abbreviation = player[0] + name[0]
 
     def get_player(self):
         """Returns the Piece's player"""
@@ -685,6 +1052,10 @@ class Piece:
         """Returns the Piece's name"""
         return self.__name
 
+    def get_abbreviation(self):
+        """Returns the Piece's two-letter abbreviation for printing"""
+        return self.__abbreviation
+
     def get_location(self):
         """Returns the Piece's location"""
         return self.__location
@@ -717,29 +1088,8 @@ class General(Piece):
     def can_move(self, square_to):
         """Determines if the General can move to the specified location. Must stay in the palace.
         Can only move one space orthogonally"""
-
-        player = super().get_player()
-        if super().can_move(square_to) is True:
-            # 9 Possible locations a general can move to orthogonally
-            red_palace = ['d1', 'd2', 'd3', 'e1', 'e2', 'e3', 'f1', 'f2', 'f3']
-            black_palace = ['d8', 'd9', 'd10', 'e8', 'e9', 'e10', 'f8', 'f9', 'f10']
-
-            row_to = int(square_to[1:])
-            col_to = ord((square_to[0])) - 97
-            row_from = int(super().get_location()[1:])
-            col_from = ord(super().get_location()[0]) - 97
-
-            # If the location is within one space orthogonally and in the palace, can move.
-            if player == 'red' and square_to in red_palace:
-                if (row_from == row_to and abs(col_to - col_from) == 1) or (
-                        col_to == col_from and abs(row_to - row_from) == 1):
-                    return True
-            if player == 'black' and square_to in black_palace:
-                if (row_from == row_to and abs(col_to - col_from) == 1) or (
-                        col_to == col_from and abs(row_to - row_from) == 1):
-                    return True
-        else:
-            return False
+        # The table only lists orthogonal steps that stay inside the palace.
+        return square_to in MOVE_TABLES['General'][self.get_player()][self.get_location()]
 
 
 class Advisor(Piece):
@@ -752,27 +1102,8 @@ class Advisor(Piece):
     def can_move(self, square_to):
         """Determines if the Advisor can move to the specified location. Must stay in the palace.
         Can only move diagonally one space."""
-
-        player = self.get_player()
-        if super().can_move(square_to) is True:
-            # Only five locations in the palace due to diagonal restriction
-            red_palace = ['d1', 'd3', 'e2', 'f1', 'f3']
-            black_palace = ['d8', 'd10', 'e9', 'f8', 'f10']
-
-            row_to = int(square_to[1:])
-            col_to = ord((square_to[0])) - 97
-            row_from = int(super().get_location()[1:])
-            col_from = ord(super().get_location()[0]) - 97
-
-            # If the space is within one space diagonally and in the palace, can move.
-            if player == 'red' and square_to in red_palace:
-                if abs(row_from - row_to) == 1 and abs(col_to - col_from) == 1:
-                    return True
-            if player == 'black' and square_to in black_palace:
-                if abs(row_from - row_to) == 1 and abs(col_to - col_from) == 1:
-                    return True
-        else:
-            return False
+        # The table only lists the five diagonal points of the palace.
+        return square_to in MOVE_TABLES['Advisor'][self.get_player()][self.get_location()]
 
 
 class Elephant(Piece):
@@ -786,27 +1117,8 @@ class Elephant(Piece):
     def can_move(self, square_to):
         """Determines if the Elephant can move to the specified location. Can move two spaces diagonally.
         Cannot cross the river, cannot jump over pieces."""
-
-        player = self.get_player()
-        if super().can_move(square_to) is True:
-            # 7 Possible Locations for either side.
-            red_side = ['c1', 'g1', 'a3', 'e3', 'i3', 'c5', 'g5']
-            black_side = ['c6', 'g6', 'a8', 'e8', 'i8', 'c10', 'g10']
-
-            row_to = int(square_to[1:])  # first letter
-            col_to = ord((square_to[0])) - 97  # second letter (10)
-            row_from = int(super().get_location()[1:])
-            col_from = ord(super().get_location()[0]) - 97
-
-            # If the location is within 2 spaces diagonally.
-            if player == 'red' and square_to in red_side:
-                if abs(row_from - row_to) == 2 and abs(col_to - col_from) == 2:
-                    return True
-            if player == 'black' and square_to in black_side:
-                if abs(row_from - row_to) == 2 and abs(col_to - col_from) == 2:
-                    return True
-        else:
-            return False
+        # The table keeps the Elephant on its own side of the river; the eye is checked by the game.
+        return square_to in MOVE_TABLES['Elephant'][self.get_player()][self.get_location()]
 
 
 class Horse(Piece):
@@ -820,19 +1132,8 @@ class Horse(Piece):
     def can_move(self, square_to):
         """Determines if the Horse can move to the specified location. Moves one space orthogonally then one space
         diagonally. Cannot jump over pieces; can be blocked orthogonally."""
-        if super().can_move(square_to) is True:
-            row_to = int(square_to[1:])
-            col_to = ord((square_to[0])) - 97
-            row_from = int(super().get_location()[1:])
-            col_from = ord(super().get_location()[0]) - 97
-
-            # If the location is within 2 spaces in one direction and 1 in the other.
-            if abs(row_from - row_to) == 1 and abs(col_to - col_from) == 2:
-                return True
-            elif abs(row_from - row_to) == 2 and abs(col_to - col_from) == 1:
-                return True
-        else:
-            return False
+        # The table holds all eight jumps; the leg is checked by the game.
+        return square_to in MOVE_TABLES['Horse'][self.get_player()][self.get_location()]
 
 
 class Chariot(Piece):
@@ -846,17 +1147,8 @@ class Chariot(Piece):
     def can_move(self, square_to):
         """Determines if the Chariot can move to the specified location. Moves/capture any distance orthogonally.
         Chariots cannot jump over pieces."""
-        if super().can_move(square_to) is True:
-            row_to = int(square_to[1:])
-            col_to = ord((square_to[0])) - 97
-            row_from = int(super().get_location()[1:])
-            col_from = ord(super().get_location()[0]) - 97
-
-            # If within the same row or column, can move.
-            if row_to == row_from or col_to == col_from:
-                return True
-        else:
-            return False
+        # Any square in the same row or column; blocking is checked by the game.
+        return square_to in LINE_SQUARES[self.get_location()]
 
 
 class Cannon(Piece):
@@ -870,17 +1162,8 @@ class Cannon(Piece):
     def can_move(self, square_to):
         """Determines if the Cannon can move to the specified location. Moves any distance orthogonally.
             To capture, Cannon must jump over a single piece(friend or foe) along the path of attack."""
-        if super().can_move(square_to) is True:
-            row_to = int(square_to[1:])
-            col_to = ord((square_to[0])) - 97
-            row_from = int(super().get_location()[1:])
-            col_from = ord(super().get_location()[0]) - 97
-
-            # If within the same row or column, can move.
-            if row_to == row_from or col_to == col_from:
-                return True
-        else:
-            return False
+        # Any square in the same row or column; screens are checked by the game.
+        return square_to in LINE_SQUARES[self.get_location()]
 
 
 class Soldier(Piece):
@@ -896,38 +1179,18 @@ class Soldier(Piece):
     def can_move(self, square_to):
         """Determines if the Soldier can move to the specified location. Moves one direction forward. Can move
         horizontally if the river has been crossed."""
-        player = self.get_player()
-        if super().can_move(square_to) is True:
-            row_to = int(square_to[1:])
-            col_to = ord((square_to[0])) - 97
-            row_from = int(super().get_location()[1:])
-            col_from = ord(super().get_location()[0]) - 97
-
-            # Horizontal movement if past the river
-            if player == 'red' and row_from > 5:
-                if row_to == row_from and abs(col_to - col_from) == 1:
-                    return True
+        # The table adds sideways steps only for Soldiers that have crossed the river.
+        return square_to in MOVE_TABLES['Soldier'][self.get_player()][self.get_location()]
 
-            # Vertical movement, cannot retreat
-            if player == 'red':
-                if col_to == col_from and (row_to - row_from) == 1:
-                    return True
-
-            # Horizontal movement if past the river
-            if player == 'black' and row_from <= 5:
-                if row_to == row_from and abs(col_to - col_from) == 1:
-                    return True
 
-            # Vertical movement, cannot retreat
-            if player == 'black':
-                if col_to == col_from and (row_to - row_from) == -1:
-                    return True
-        else:
-            return False
+# Piece classes by name, for rebuilding a board from a snapshot.
+PIECE_CLASSES = {'General': General, 'Advisor': Advisor, 'Elephant': Elephant, 'Horse': Horse, 'RChariot': Chariot,
+                 'Cannon': Cannon, 'Soldier': Soldier}
 
 
-game = XiangqiGame()
-move_result = game.make_move('c1', 'e3')
-black_in_check = game.is_in_check('black')
-game.make_move('e7', 'e6')
-state = game.get_game_state()
+if __name__ == '__main__':
+    game = XiangqiGame()
+    move_result = game.make_move('c1', 'e3')
+    black_in_check = game.is_in_check('black')
+    game.make_move('e7', 'e6')
+    state = game.get_game_state()
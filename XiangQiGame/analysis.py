@@ -0,0 +1,533 @@
+# Author: Kenny Seng
+# Date: 10/19/2026
+# Description: Time-bounded, interruptible multi-PV analysis of a XiangqiGame or FastXiangqi position. An Analyzer
+#              runs an iterative deepening alpha-beta search and keeps its hash table between calls on the same game.
+#              The search only sees a small position interface, which GamePosition and FastPosition provide for the
+#              two rules classes.
+
+import threading
+import time
+import weakref
+
+from XiangqiGame import XiangqiGame, PIECE_VALUES
+from fast_rules import FastXiangqi, SOLDIER, SQUARES, VALUES
+
+# Scores are in material units from the point of view of the player to move. A mate found at ply n scores
+# MATE_SCORE - n, so shorter mates score higher.
+MATE_SCORE = 100000
+INFINITY = MATE_SCORE + 1
+
+# Hash table entry bounds.
+EXACT, LOWER, UPPER = 0, 1, 2
+
+
+class SearchStopped(Exception):
+    """Raised inside the search when the deadline, node limit, or a stop request is reached."""
+
+
+class AnalysisLine:
+    """Represents one line of analysis: the moves of the principal variation, its score, and the search depth."""
+
+    def __init__(self, moves, score, depth):
+        """Initializes the line's moves, score, and depth."""
+        self.__moves = moves
+        self.__score = score
+        self.__depth = depth
+
+    def get_moves(self):
+        """Returns the list of (square_from, square_to) moves, starting with the move to play"""
+        return self.__moves
+
+    def get_move(self):
+        """Returns the first move of the line"""
+        return self.__moves[0]
+
+    def get_score(self):
+        """Returns the score of the line for the player to move"""
+        return self.__score
+
+    def get_depth(self):
+        """Returns the depth the line was searched to"""
+        return self.__depth
+
+    def is_mate(self):
+        """Returns True if the score is a forced mate for either side"""
+        return abs(self.__score) >= MATE_SCORE - 1000
+
+    def __repr__(self):
+        """Returns the line as text, e.g. 'depth 3 score 120: h3-e3 h10-g8'"""
+        moves = ' '.join(square_from + '-' + square_to for square_from, square_to in self.__moves)
+        return 'depth ' + str(self.__depth) + ' score ' + str(self.__score) + ': ' + moves
+
+
+class GamePosition:
+    """The search interface to a XiangqiGame. Moves are (square_from, square_to) pairs."""
+
+    def __init__(self, game):
+        """Initializes the position, which the search plays moves on and takes them back."""
+        self.__game = game
+        self.__records = []
+
+    def get_game_state(self):
+        """Returns the game state; UNFINISHED, RED_WON, or BLACK_WON"""
+        return self.__game.get_game_state()
+
+    def get_hash(self):
+        """Returns the Zobrist hash of the position"""
+        return self.__game.get_hash()
+
+    def legal_moves(self):
+        """Returns the legal moves of the player to move"""
+        return self.__game.get_legal_moves(self.__game.get_player_to_move())
+
+    def is_in_check(self):
+        """Returns True if the player to move is in check"""
+        return self.__game.is_in_check(self.__game.get_player_to_move())
+
+    def evasions(self):
+        """Returns the legal moves of the player to move, who is in check"""
+        return self.__game.get_evasions(self.__game.get_player_to_move())
+
+    def captures(self):
+        """Returns the legal captures of the player to move"""
+        return get_legal_captures(self.__game, self.__game.get_player_to_move())
+
+    def get_value(self, square):
+        """Returns the value of the piece on square, or 0 if it is empty"""
+        piece = self.__game.get_piece(square)
+        if piece is None:
+            return 0
+        return PIECE_VALUES[piece.get_name()]
+
+    def see(self, move):
+        """Returns the static exchange evaluation of the capture"""
+        return self.__game.see(move[0], move[1])
+
+    def evaluate(self):
+        """Returns the static score for the player to move"""
+        return evaluate(self.__game, self.__game.get_player_to_move())
+
+    def play(self, move):
+        """Makes a legal move"""
+        self.__records.append(self.__game.do_move(move[0], move[1]))
+
+    def unplay(self):
+        """Takes back the last move made by play"""
+        self.__game.undo_move(self.__records.pop())
+
+    def to_squares(self, move):
+        """Returns the move as (square_from, square_to)"""
+        return move
+
+
+class FastPosition:
+    """The search interface to a FastXiangqi. Moves are (from index, to index) pairs."""
+
+    def __init__(self, position):
+        """Initializes the position, which the search plays moves on and takes them back."""
+        self.__position = position
+
+    def get_game_state(self):
+        """Returns the game state; UNFINISHED, RED_WON, or BLACK_WON"""
+        return self.__position.get_game_state()
+
+    def get_hash(self):
+        """Returns the Zobrist hash of the position"""
+        return self.__position.get_hash()
+
+    def legal_moves(self):
+        """Returns the legal moves of the side to move"""
+        return self.__position.legal_moves()
+
+    def is_in_check(self):
+        """Returns True if the side to move is in check"""
+        return self.__position.is_attacked_general(self.__position.get_side())
+
+    def evasions(self):
+        """Returns the legal moves of the side to move, which is in check"""
+        return self.__position.legal_moves()
+
+    def captures(self):
+        """Returns the legal captures of the side to move"""
+        position = self.__position
+        board = position.get_board()
+        return [move for move in position.pseudo_moves(position.get_side())
+                if board[move[1]] != 0 and position.is_legal(move)]
+
+    def get_value(self, square):
+        """Returns the value of the piece on square, or 0 if it is empty"""
+        return VALUES[abs(self.__position.get_board()[square])]
+
+    def see(self, move):
+        """Returns the static exchange evaluation of the capture"""
+        return self.__position.see(move)
+
+    def evaluate(self):
+        """Returns the static score for the side to move"""
+        return evaluate_board(self.__position.get_board(), self.__position.get_side())
+
+    def play(self, move):
+        """Makes a legal move"""
+        self.__position.play(move)
+
+    def unplay(self):
+        """Takes back the last move made by play"""
+        self.__position.unplay()
+
+    def to_squares(self, move):
+        """Returns the move as (square_from, square_to)"""
+        return SQUARES[move[0]], SQUARES[move[1]]
+
+
+class Analyzer:
+    """Searches XiangqiGame and FastXiangqi positions. The hash table is kept between calls so that analysing
+    successive positions of the same game reuses earlier work. stop() may be called from any thread."""
+
+    def __init__(self, table_size=200000):
+        """Initializes an empty hash table holding at most table_size positions. With a table_size of 0 there is
+        no hash table, positions are never hashed, and the lines are only one move long."""
+        self.__table = {}
+        self.__table_size = table_size
+        self.__stop_requested = threading.Event()
+        self.__stop_event = None
+        self.__deadline = None
+        self.__node_limit = None
+        self.__nodes = 0
+
+    def stop(self):
+        """Asks a running analysis to stop. The analysis returns the lines of the last completed depth."""
+        self.__stop_requested.set()
+
+    def clear(self):
+        """Empties the hash table"""
+        self.__table.clear()
+
+    def get_nodes(self):
+        """Returns the number of nodes searched by the last analysis"""
+        return self.__nodes
+
+    def analyze(self, game, multipv=1, deadline=None, nodes=None, max_depth=64, callback=None, stop_event=None):
+        """Returns the best multipv lines for the player to move, best first, as AnalysisLine objects.
+
+        The search deepens one ply at a time until max_depth, the deadline (a time.monotonic() value), the node
+        limit, stop(), or stop_event ends it. After each completed depth, callback (if given) is called with the
+        lines found so far. game is a XiangqiGame or a FastXiangqi, and is never modified. Either way the moves of
+        the lines are (square_from, square_to) pairs.
+
+        There are always multipv lines (or one per legal move, if fewer), however soon the search is stopped. If
+        depth 1 does not finish, the lines it did not reach are filled with the other root moves, scored by
+        evaluate() after the move and marked as depth 0."""
+        self.__stop_requested.clear()
+        self.__stop_event = stop_event
+        self.__deadline = deadline
+        self.__node_limit = nodes
+        self.__nodes = 0
+
+        # Search on a private, silent copy of the position only, so the caller's game (with its cache and renderer)
+        # is untouched, even if the search is interrupted.
+        if isinstance(game, FastXiangqi):
+            position = FastPosition(game.copy())
+        else:
+            snapshot = game.get_snapshot()
+            game = XiangqiGame(verbose=False)
+            game.load_snapshot(snapshot)
+            position = GamePosition(game)
+        root_moves = self.order_moves(position, position.legal_moves(), None)
+        if len(root_moves) == 0 or position.get_game_state() != 'UNFINISHED':
+            return []
+        multipv = min(multipv, len(root_moves))
+
+        lines = []
+        for depth in range(1, max_depth + 1):
+            found = []
+            excluded = []
+            try:
+                # Each line is the best move that has not already been picked as a better line at this depth.
+                for index in range(multipv):
+                    move, score = self.search_root(position, root_moves, excluded, depth)
+                    excluded.append(move)
+                    found.append(self.make_line(position, self.get_principal_variation(position, move, depth),
+                                                score, depth))
+            except SearchStopped:
+                # Keep the completed depth; only fall back on a partial one if nothing else has finished.
+                if len(lines) == 0:
+                    lines = found + self.get_static_lines(position, root_moves, excluded, multipv - len(found))
+                break
+            lines = found
+
+            # Search the previous best moves first at the next depth.
+            root_moves = excluded + [move for move in root_moves if move not in excluded]
+
+            if callback is not None:
+                callback(lines)
+            if lines[0].is_mate():
+                break
+        return lines
+
+    def make_line(self, position, moves, score, depth):
+        """Returns an AnalysisLine with the moves given as (square_from, square_to) pairs."""
+        return AnalysisLine([position.to_squares(move) for move in moves], score, depth)
+
+    def get_static_lines(self, position, root_moves, taken, count):
+        """Returns count depth 0 lines for the root moves not already taken, best first, each scored by evaluate()
+        after the move."""
+        lines = []
+        for move in root_moves:
+            if move in taken:
+                continue
+            position.play(move)
+            lines.append(self.make_line(position, [move], -position.evaluate(), 0))
+            position.unplay()
+        lines.sort(key=lambda line: -line.get_score())
+        return lines[:count]
+
+    def search_root(self, position, root_moves, excluded, depth):
+        """Returns the best (move, score) among the root moves that are not excluded."""
+        alpha = -INFINITY
+        best_move = None
+        for move in root_moves:
+            if move in excluded:
+                continue
+            position.play(move)
+            try:
+                score = -self.search(position, depth - 1, -INFINITY, -alpha, 1)
+            finally:
+                position.unplay()
+            if score > alpha or best_move is None:
+                alpha = score
+                best_move = move
+        return best_move, alpha
+
+    def search(self, position, depth, alpha, beta, ply):
+        """Negamax alpha-beta search. Returns the score of the position for the player to move."""
+        self.count_node()
+        if depth <= 0:
+            return self.quiesce(position, alpha, beta, ply, 4)
+
+        key = None
+        table_move = None
+        if self.__table_size > 0:
+            key = position.get_hash()
+            entry = self.__table.get(key)
+            if entry is not None:
+                entry_depth, entry_score, entry_bound, table_move = entry
+                if entry_depth >= depth:
+                    entry_score = self.score_from_table(entry_score, ply)
+                    if entry_bound == EXACT:
+                        return entry_score
+                    if entry_bound == LOWER and entry_score >= beta:
+                        return entry_score
+                    if entry_bound == UPPER and entry_score <= alpha:
+                        return entry_score
+
+        # No legal moves loses, whether by checkmate or stalemate.
+        moves = position.legal_moves()
+        if len(moves) == 0:
+            return -MATE_SCORE + ply
+
+        original_alpha = alpha
+        best_score = -INFINITY
+        best_move = None
+        for move in self.order_moves(position, moves, table_move):
+            position.play(move)
+            try:
+                score = -self.search(position, depth - 1, -beta, -alpha, ply + 1)
+            finally:
+                position.unplay()
+            if score > best_score:
+                best_score = score
+                best_move = move
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                break
+
+        if key is not None:
+            if best_score <= original_alpha:
+                bound = UPPER
+            elif best_score >= beta:
+                bound = LOWER
+            else:
+                bound = EXACT
+            self.store(key, depth, self.score_to_table(best_score, ply), bound, best_move)
+        return best_score
+
+    def quiesce(self, position, alpha, beta, ply, depth):
+        """Searches captures only, so the static evaluation is never taken in the middle of an exchange."""
+        self.count_node()
+
+        # The capture limit also ends a line of checks, with the static score.
+        if depth <= 0:
+            return position.evaluate()
+
+        # In check there is no standing pat: every evasion is searched, and having none loses.
+        if position.is_in_check():
+            moves = position.evasions()
+            if len(moves) == 0:
+                return -MATE_SCORE + ply
+        else:
+            stand_pat = position.evaluate()
+            if stand_pat >= beta:
+                return stand_pat
+            if stand_pat > alpha:
+                alpha = stand_pat
+            # Captures that lose material in the exchange cannot raise alpha, so they are not searched. Taking
+            # a piece worth at least as much as the capturer never loses, so the exchange is only worked out
+            # for the others.
+            moves = []
+            for move in position.captures():
+                if position.get_value(move[1]) >= position.get_value(move[0]) or position.see(move) >= 0:
+                    moves.append(move)
+
+        for move in self.order_moves(position, moves, None):
+            position.play(move)
+            try:
+                score = -self.quiesce(position, -beta, -alpha, ply + 1, depth - 1)
+            finally:
+                position.unplay()
+            if score >= beta:
+                return score
+            if score > alpha:
+                alpha = score
+        return alpha
+
+    def order_moves(self, position, moves, table_move):
+        """Returns the moves with the hash table move first, then captures of the most valuable piece by the least
+        valuable attacker, then quiet moves."""
+        def move_key(move):
+            if move == table_move:
+                return -INFINITY
+            captured = position.get_value(move[1])
+            if captured == 0:
+                return 0
+            return -(captured * 10 - position.get_value(move[0]) // 100)
+        return sorted(moves, key=move_key)
+
+    def get_principal_variation(self, position, move, depth):
+        """Returns the line starting with move, continued by following best moves through the hash table."""
+        line = [move]
+        position.play(move)
+        played = 1
+        try:
+            if self.__table_size == 0:
+                return line
+            seen = {position.get_hash()}
+            while len(line) < depth:
+                entry = self.__table.get(position.get_hash())
+                if entry is None or entry[3] is None:
+                    break
+                next_move = entry[3]
+                if next_move not in position.legal_moves():
+                    break
+                position.play(next_move)
+                played += 1
+                line.append(next_move)
+                if position.get_hash() in seen:
+                    break
+                seen.add(position.get_hash())
+        finally:
+            for _ in range(played):
+                position.unplay()
+        return line
+
+    def store(self, key, depth, score, bound, move):
+        """Stores a search result, dropping the oldest entry once the table is full."""
+        if key not in self.__table and len(self.__table) >= self.__table_size:
+            del self.__table[next(iter(self.__table))]
+        self.__table[key] = (depth, score, bound, move)
+
+    def score_to_table(self, score, ply):
+        """Mate scores are stored relative to the position, not the root, so they stay valid in other searches."""
+        if score >= MATE_SCORE - 1000:
+            return score + ply
+        if score <= -MATE_SCORE + 1000:
+            return score - ply
+        return score
+
+    def score_from_table(self, score, ply):
+        """Converts a stored mate score back to a distance from the root."""
+        if score >= MATE_SCORE - 1000:
+            return score - ply
+        if score <= -MATE_SCORE + 1000:
+            return score + ply
+        return score
+
+    def count_node(self):
+        """Counts a node and raises SearchStopped once the search should end. The clock and the stop flags are
+        only looked at every 16 nodes."""
+        self.__nodes += 1
+        if self.__node_limit is not None and self.__nodes >= self.__node_limit:
+            raise SearchStopped()
+        if self.__nodes % 16 == 0:
+            if self.__stop_requested.is_set():
+                raise SearchStopped()
+            if self.__stop_event is not None and self.__stop_event.is_set():
+                raise SearchStopped()
+            if self.__deadline is not None and time.monotonic() >= self.__deadline:
+                raise SearchStopped()
+
+
+def get_legal_captures(game, player):
+    """Returns the specified player's legal captures, without generating quiet moves."""
+    captures = []
+    for piece in game.get_pieces(player):
+        for square_to in game.get_candidate_squares(piece):
+            target = game.get_piece(square_to)
+            if target is not None and target.get_player() != player:
+                if game.is_legal_move(piece.get_location(), square_to):
+                    captures.append((piece.get_location(), square_to))
+    return captures
+
+
+def evaluate_board(board, side):
+    """Returns the material balance for side on a FastXiangqi board, scored like evaluate."""
+    score = 0
+    for index, piece in enumerate(board):
+        if piece == 0:
+            continue
+        value = VALUES[abs(piece)]
+        # Red Soldiers cross at row 6 (index 45 onwards), Black Soldiers at row 5.
+        if abs(piece) == SOLDIER and (index >= 45) == (piece > 0):
+            value *= 2
+        if piece * side > 0:
+            score += value
+        else:
+            score -= value
+    return score
+
+
+def evaluate(game, player):
+    """Returns the material balance for the specified player. Soldiers that have crossed the river count double."""
+    score = 0
+    for row in game.get_board():
+        for piece in row:
+            if piece is None:
+                continue
+            value = PIECE_VALUES[piece.get_name()]
+            if piece.get_name() == 'Soldier':
+                row_number = int(piece.get_location()[1:])
+                if (piece.get_player() == 'red' and row_number > 5) or (
+                        piece.get_player() == 'black' and row_number <= 5):
+                    value *= 2
+            if piece.get_player() == player:
+                score += value
+            else:
+                score -= value
+    return score
+
+
+# One Analyzer per game, so successive calls on the same game share a hash table.
+analyzers = weakref.WeakKeyDictionary()
+
+
+def get_analyzer(game):
+    """Returns the Analyzer used for the specified game, creating it on first use. Another thread can call its
+    stop() method to cancel a running analyze()."""
+    if game not in analyzers:
+        analyzers[game] = Analyzer()
+    return analyzers[game]
+
+
+def analyze(game, multipv=1, deadline=None, nodes=None, max_depth=64, callback=None, stop_event=None):
+    """Returns the best multipv lines for the player to move in the game. See Analyzer.analyze."""
+    return get_analyzer(game).analyze(game, multipv, deadline, nodes, max_depth, callback, stop_event)
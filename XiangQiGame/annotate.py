@@ -0,0 +1,142 @@
+# Author: Kenny Seng
+# Date: 10/19/2026
+# Description: Streaming blunder annotation of whole game archives. Games are read one at a time, handed to a pool
+#              of processes only as fast as results come back, and every ply is scored with a bounded Analyzer
+#              search on the FastXiangqi rules core. Moves that lose more than a threshold compared to the best
+#              move are flagged, and each annotated game is appended to the output as soon as it is done. The
+#              output doubles as the checkpoint, so an interrupted run resumes where it stopped.
+
+import argparse
+import json
+import multiprocessing
+import os
+import time
+
+from analysis import Analyzer, MATE_SCORE
+from archive import format_move, read_archive, write_game
+from evaluation import imap_bounded
+from fast_rules import FastXiangqi
+
+
+def search(analyzer, position, settings):
+    """Returns the best (square_from, square_to) move for the side to move and its score, within the node, depth,
+    and time limits of the settings. A finished game or a position without legal moves returns (None, a lost
+    score)."""
+    deadline = None if settings['seconds'] is None else time.monotonic() + settings['seconds']
+    lines = analyzer.analyze(position, deadline=deadline, nodes=settings['nodes'], max_depth=settings['max_depth'])
+    if len(lines) == 0:
+        return None, -MATE_SCORE
+    return lines[0].get_move(), lines[0].get_score()
+
+
+def annotate_game(job):
+    """Annotates one game in a worker process. job is (game id, moves, result, settings). Returns the game id,
+    the moves that were replayed, the result, a list of per-ply annotations, and an error message or None."""
+    game_id, moves, result, settings = job
+    # One Analyzer per game, so each ply reuses the hash table of the searches before it.
+    analyzer = Analyzer()
+    position = FastXiangqi()
+    annotations = []
+    error = None
+    # Each position is searched once: its score is the best score for this ply and, negated, the score of the
+    # move played into it.
+    best_move, best_score = search(analyzer, position, settings)
+    for ply, move in enumerate(moves, 1):
+        player = position.get_player_to_move()
+        if not position.make_move(move[0], move[1]):
+            error = 'illegal move ' + format_move(move) + ' at ply ' + str(ply)
+            break
+        next_best_move, next_best_score = search(analyzer, position, settings)
+        played_score = -next_best_score
+        drop = 0 if move == best_move else max(0, best_score - played_score)
+        annotations.append({'ply': ply, 'player': player, 'move': format_move(move),
+                            'best': None if best_move is None else format_move(best_move),
+                            'score': played_score, 'drop': drop, 'blunder': drop >= settings['threshold']})
+        best_move, best_score = next_best_move, next_best_score
+    return game_id, moves[:len(annotations)], result, annotations, error
+
+
+def write_annotated(output, annotated):
+    """Appends one game returned by annotate_game to the output and flushes it, so the output is a valid
+    checkpoint at any moment."""
+    game_id, moves, result, annotations, error = annotated
+    fields = {'annotations': annotations, 'blunders': sum(1 for annotation in annotations if annotation['blunder'])}
+    if error is not None:
+        fields['error'] = error
+    write_game(output, game_id, moves, result, **fields)
+    output.flush()
+
+
+def completed_games(output_path):
+    """Returns the ids of the games already in the output. A partly written last line, left by an interrupted
+    run, is cut off so that new games are appended after complete lines only."""
+    done = set()
+    if not os.path.exists(output_path):
+        return done
+    with open(output_path, 'rb+') as output:
+        data = output.read()
+        end = data.rfind(b'\n') + 1
+        if end < len(data):
+            output.truncate(end)
+        for line in data[:end].splitlines():
+            if line.strip():
+                done.add(json.loads(line)['id'])
+    return done
+
+
+def annotate_archives(paths, output_path, threshold=200, nodes=2000, seconds=None, max_depth=3, processes=None,
+                      time_budget=None):
+    """Annotates every game in the archives that is not already in the output, appending one JSON line per game
+    (see archive.write_game) with an 'annotations' list and a 'blunders' count. Returns the number of games
+    annotated in this run.
+
+    Games are read from the archives only as workers become free (all cores by default; 0 annotates in this
+    process), so no more than two games per worker are ever waiting. No new game is started after time_budget
+    seconds, if given; the games already started are finished, and the next run carries on from there."""
+    start = time.monotonic()
+    done = completed_games(output_path)
+    settings = {'threshold': threshold, 'nodes': nodes, 'seconds': seconds, 'max_depth': max_depth}
+
+    def jobs():
+        """Yields the games still to annotate, until the time budget runs out."""
+        for game in read_archive(paths):
+            if time_budget is not None and time.monotonic() - start >= time_budget:
+                return
+            if game.get_game_id() not in done:
+                yield game.get_game_id(), game.get_moves(), game.get_result(), settings
+
+    annotated = 0
+    with open(output_path, 'a') as output:
+        if processes == 0:
+            for result in map(annotate_game, jobs()):
+                write_annotated(output, result)
+                annotated += 1
+        else:
+            workers = processes or os.cpu_count() or 1
+            with multiprocessing.Pool(workers) as pool:
+                for result in imap_bounded(pool, annotate_game, jobs(), 2 * workers, ordered=False):
+                    write_annotated(output, result)
+                    annotated += 1
+    return annotated
+
+
+def main():
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description='Flag blunders in Xiangqi game archives.')
+    parser.add_argument('output', help='annotated JSON lines; also used to resume')
+    parser.add_argument('archives', nargs='+', help='archive files or directories')
+    parser.add_argument('--threshold', type=int, default=200, help='score drop that counts as a blunder')
+    parser.add_argument('--nodes', type=int, default=2000, help='node limit per ply')
+    parser.add_argument('--seconds', type=float, default=None, help='time limit per ply')
+    parser.add_argument('--depth', type=int, default=3, help='depth limit per ply')
+    parser.add_argument('--processes', type=int, default=None, help='worker processes (default: all cores)')
+    parser.add_argument('--time-budget', type=float, default=None, help='stop starting new games after this many '
+                                                                         'seconds')
+    args = parser.parse_args()
+    count = annotate_archives(args.archives, args.output, args.threshold, args.nodes, args.seconds, args.depth,
+                              args.processes, args.time_budget)
+    print('Annotated ' + str(count) + ' games.')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+# Author: Kenny Seng
+# Date: 10/19/2026
+# Description: Reading and writing game archives. An archive is a text file with one JSON object per line:
+#              {"id": "game-1", "moves": ["h3-e3", "h10-g8", ...], "result": "RED_WON"}
+#              The result is optional. Moves may also be given as ["h3", "e3"] pairs.
+
+import json
+import os
+import sys
+
+
+class ArchivedGame:
+    """Represents one game read from an archive: its id, its moves as (square_from, square_to) pairs, and the
+    recorded result (None if the archive does not give one)."""
+
+    def __init__(self, game_id, moves, result=None):
+        """Initializes the game's id, moves, and result."""
+        self.__game_id = game_id
+        self.__moves = moves
+        self.__result = result
+
+    def get_game_id(self):
+        """Returns the game's id"""
+        return self.__game_id
+
+    def get_moves(self):
+        """Returns the list of (square_from, square_to) moves"""
+        return self.__moves
+
+    def get_result(self):
+        """Returns the recorded result, or None"""
+        return self.__result
+
+
+def parse_move(move):
+    """Returns a (square_from, square_to) pair from 'h3-e3' or ['h3', 'e3']. Raises ValueError for anything else."""
+    if isinstance(move, str):
+        squares = move.split('-')
+    elif isinstance(move, (list, tuple)):
+        squares = list(move)
+    else:
+        squares = []
+    if len(squares) != 2 or not all(isinstance(square, str) for square in squares):
+        raise ValueError('malformed move ' + repr(move))
+    return squares[0], squares[1]
+
+
+def format_move(move):
+    """Returns a (square_from, square_to) pair as 'h3-e3'."""
+    return move[0] + '-' + move[1]
+
+
+def list_archives(paths):
+    """Returns the archive files named by paths, expanding directories to the files inside them, in order."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                if not name.startswith('.'):
+                    files.append(os.path.join(path, name))
+        else:
+            files.append(path)
+    return files
+
+
+def report_bad_record(path, line_number, message):
+    """Prints a warning about a line of an archive that was skipped."""
+    print(path + ':' + str(line_number) + ': skipped bad record: ' + message, file=sys.stderr)
+
+
+def read_archive(paths, on_error=report_bad_record):
+    """Yields an ArchivedGame for each line of the archives, one at a time, so archives of any size can be
+    streamed. A game without an id is named after its file and line number.
+
+    A line that is not a valid game record (bad JSON, or a malformed move) is skipped and passed to
+    on_error(path, line_number, message), so one bad line cannot stop the rest of the archive being read."""
+    if isinstance(paths, str):
+        paths = [paths]
+    for path in list_archives(paths):
+        with open(path) as archive:
+            for line_number, line in enumerate(archive, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                    if not isinstance(record, dict) or not isinstance(record.get('moves', []), list):
+                        raise ValueError('not a game record')
+                    moves = [parse_move(move) for move in record.get('moves', [])]
+                except ValueError as exception:
+                    on_error(path, line_number, str(exception))
+                    continue
+                game_id = record.get('id')
+                if game_id is None:
+                    game_id = os.path.basename(path) + ':' + str(line_number)
+                yield ArchivedGame(str(game_id), moves, record.get('result'))
+
+
+def write_game(archive, game_id, moves, result=None, **fields):
+    """Writes one game as a line of JSON to an open archive file. Extra fields are written as given."""
+    record = {'id': game_id, 'moves': [format_move(move) for move in moves]}
+    if result is not None:
+        record['result'] = result
+    record.update(fields)
+    archive.write(json.dumps(record) + '\n')
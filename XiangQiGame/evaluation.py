@@ -0,0 +1,139 @@
+# Author: Kenny Seng
+# Date: 10/19/2026
+# Description: Bulk replay of scripted move sequences through XiangqiGame, used as a reference oracle. Each
+#              sequence is replayed silently on its own game and summarised; sequences are spread across worker
+#              processes and the results are streamed back in order or as they finish.
+
+import multiprocessing
+import os
+import queue
+
+from XiangqiGame import XiangqiGame
+from archive import parse_move
+
+# Marks the end of the input in imap_bounded.
+END = object()
+
+
+class GameEvaluation:
+    """Represents the outcome of replaying one move sequence: what make_move returned for each move, the final
+    game state, and whether each player is in check at the end."""
+
+    def __init__(self, index, move_results, game_state, in_check, error=None):
+        """Initializes the sequence's position in the input, the results, and the error (if replay failed)."""
+        self.__index = index
+        self.__move_results = move_results
+        self.__game_state = game_state
+        self.__in_check = in_check
+        self.__error = error
+
+    def get_index(self):
+        """Returns the position of the sequence in the input, counting from 0"""
+        return self.__index
+
+    def get_move_results(self):
+        """Returns the list of True/False results of make_move, one per move replayed"""
+        return self.__move_results
+
+    def get_game_state(self):
+        """Returns the final game state; UNFINISHED, RED_WON, or BLACK_WON"""
+        return self.__game_state
+
+    def is_in_check(self, player):
+        """Returns True if the specified player is in check at the end of the sequence"""
+        return self.__in_check[player]
+
+    def get_error(self):
+        """Returns the error raised while replaying, or None. Moves after the error are not replayed."""
+        return self.__error
+
+    def to_dict(self):
+        """Returns the evaluation as a dictionary, e.g. for writing as JSON"""
+        return {'index': self.__index, 'move_results': self.__move_results, 'game_state': self.__game_state,
+                'red_in_check': self.__in_check['red'], 'black_in_check': self.__in_check['black'],
+                'error': self.__error}
+
+
+def evaluate_game(index, moves):
+    """Replays one sequence of moves ('h3-e3' or ('h3', 'e3')) on a new, silent XiangqiGame and returns its
+    GameEvaluation. Every move is passed to make_move, including moves after the game has ended and moves to
+    squares off the board, which make_move rejects. Only a move that cannot be parsed stops the replay."""
+    game = XiangqiGame(verbose=False)
+    move_results = []
+    error = None
+    try:
+        for move in moves:
+            square_from, square_to = parse_move(move)
+            move_results.append(game.make_move(square_from, square_to))
+    except ValueError as exception:
+        error = type(exception).__name__ + ': ' + str(exception)
+    in_check = {'red': game.is_in_check('red'), 'black': game.is_in_check('black')}
+    return GameEvaluation(index, move_results, game.get_game_state(), in_check, error)
+
+
+def evaluate_chunk(chunk):
+    """Evaluates a list of (index, moves) pairs in a worker process."""
+    return [evaluate_game(index, moves) for index, moves in chunk]
+
+
+def make_chunks(move_lists, chunk_size):
+    """Yields lists of (index, moves) pairs, chunk_size at a time, without reading the whole input first."""
+    chunk = []
+    for index, moves in enumerate(move_lists):
+        chunk.append((index, list(moves)))
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def imap_bounded(pool, function, items, max_pending, ordered=True):
+    """Yields function(item) for each item, computed in pool, like pool.imap (or imap_unordered when ordered is
+    False). Unlike those, the next item is only taken from items while fewer than max_pending are waiting, so a
+    large or endless input is never read far ahead of the results."""
+    items = iter(items)
+    pending = {}
+    finished = queue.Queue()
+    next_index = 0
+    exhausted = False
+    while True:
+        while not exhausted and len(pending) < max_pending:
+            item = next(items, END)
+            if item is END:
+                exhausted = True
+                break
+            if ordered:
+                pending[next_index] = pool.apply_async(function, (item,))
+            else:
+                def report(result, index=next_index):
+                    """Queues the index of an item once it has finished, with a result or an error."""
+                    finished.put(index)
+                pending[next_index] = pool.apply_async(function, (item,), callback=report, error_callback=report)
+            next_index += 1
+        if not pending:
+            return
+        # The oldest item in order, otherwise whichever finished first. get() raises any error from the worker.
+        index = next(iter(pending)) if ordered else finished.get()
+        yield pending.pop(index).get()
+
+
+def evaluate_games(move_lists, processes=None, ordered=True, chunk_size=32):
+    """Yields a GameEvaluation for each move sequence in move_lists, which may be any iterable.
+
+    Sequences are replayed in a pool of processes (all cores by default; 0 replays in this process). Only a
+    couple of chunks per process are read ahead of the results, so the input is consumed as the results are.
+    With ordered set to False, results are yielded as soon as they are ready; use get_index to match them to the
+    input."""
+    chunks = make_chunks(move_lists, chunk_size)
+    if processes == 0:
+        for chunk in chunks:
+            for evaluation in evaluate_chunk(chunk):
+                yield evaluation
+        return
+
+    workers = processes or os.cpu_count() or 1
+    with multiprocessing.Pool(workers) as pool:
+        for chunk_results in imap_bounded(pool, evaluate_chunk, chunks, 2 * workers, ordered):
+            for evaluation in chunk_results:
+                yield evaluation
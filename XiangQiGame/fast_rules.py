@@ -0,0 +1,375 @@
+# Author: Kenny Seng
+# Date: 10/19/2026
+# Description: A compact rules core for Xiangqi. The board is a flat list of 90 integers so that move generation,
+#              check detection, and random playouts avoid creating strings and Piece objects. It has the same
+#              make_move / is_in_check / get_game_state interface as XiangqiGame, without any printing.
+
+from XiangqiGame import SQUARES, MOVE_TABLES, RAYS, ZOBRIST, ZOBRIST_BLACK_TO_MOVE, PIECE_VALUES
+
+# Sides. A piece is stored as side * kind, so Red pieces are positive and Black pieces are negative.
+RED = 1
+BLACK = -1
+PLAYERS = {RED: 'red', BLACK: 'black'}
+SIDES = {'red': RED, 'black': BLACK}
+
+# Piece kinds
+GENERAL, ADVISOR, ELEPHANT, HORSE, CHARIOT, CANNON, SOLDIER = 1, 2, 3, 4, 5, 6, 7
+NAMES = {GENERAL: 'General', ADVISOR: 'Advisor', ELEPHANT: 'Elephant', HORSE: 'Horse', CHARIOT: 'RChariot',
+         CANNON: 'Cannon', SOLDIER: 'Soldier'}
+KINDS = {name: kind for kind, name in NAMES.items()}
+
+# Piece values by kind (index 0 is an empty square).
+VALUES = [0] + [PIECE_VALUES[NAMES[kind]] for kind in range(1, len(NAMES) + 1)]
+
+# Square index = (row - 1) * 9 + column, so 'a1' is 0 and 'i10' is 89.
+INDEX = {square: index for index, square in enumerate(SQUARES)}
+
+
+def build_step_tables():
+    """Converts the shared MOVE_TABLES to square indexes: STEPS[side][kind][index] -> [(to, block or -1)]."""
+    steps = {}
+    for side, player in PLAYERS.items():
+        steps[side] = {}
+        for kind in (GENERAL, ADVISOR, ELEPHANT, HORSE, SOLDIER):
+            table = MOVE_TABLES[NAMES[kind]][player]
+            steps[side][kind] = []
+            for square in SQUARES:
+                moves = []
+                for destination, block in table[square].items():
+                    moves.append((INDEX[destination], -1 if block is None else INDEX[block]))
+                steps[side][kind].append(moves)
+    return steps
+
+
+def build_attack_tables(steps):
+    """Returns the reverse Horse table, [index] -> [(horse square, leg)], and the reverse Soldier table,
+    {side: [index] -> [soldier squares]}, so check detection can look outward from the General."""
+    horse_attackers = [[] for _ in range(90)]
+    soldier_attackers = {RED: [[] for _ in range(90)], BLACK: [[] for _ in range(90)]}
+    for index in range(90):
+        for destination, leg in steps[RED][HORSE][index]:
+            horse_attackers[destination].append((index, leg))
+        for side in (RED, BLACK):
+            for destination, _ in steps[side][SOLDIER][index]:
+                soldier_attackers[side][destination].append(index)
+    return horse_attackers, soldier_attackers
+
+
+def build_reverse_steps(steps):
+    """Returns the step tables looked up by destination: REVERSE_STEPS[side][kind][index] -> [(from, block or -1)],
+    so the pieces that can capture on a square are found without generating every move."""
+    reverse = {}
+    for side in (RED, BLACK):
+        reverse[side] = {}
+        for kind, table in steps[side].items():
+            sources = [[] for _ in range(90)]
+            for index in range(90):
+                for destination, block in table[index]:
+                    sources[destination].append((index, block))
+            reverse[side][kind] = sources
+    return reverse
+
+
+STEPS = build_step_tables()
+HORSE_ATTACKERS, SOLDIER_ATTACKERS = build_attack_tables(STEPS)
+REVERSE_STEPS = build_reverse_steps(STEPS)
+INDEX_RAYS = [[[INDEX[square] for square in ray] for ray in RAYS[square]] for square in SQUARES]
+
+# The first two rays run up and down a column, where Generals face each other.
+VERTICAL_RAYS = 2
+
+START_BOARD = [0] * 90
+for _square, _name, _side in (('a1', 'RChariot', RED), ('b1', 'Horse', RED), ('c1', 'Elephant', RED),
+                              ('d1', 'Advisor', RED), ('e1', 'General', RED), ('f1', 'Advisor', RED),
+                              ('g1', 'Elephant', RED), ('h1', 'Horse', RED), ('i1', 'RChariot', RED),
+                              ('b3', 'Cannon', RED), ('h3', 'Cannon', RED), ('a4', 'Soldier', RED),
+                              ('c4', 'Soldier', RED), ('e4', 'Soldier', RED), ('g4', 'Soldier', RED),
+                              ('i4', 'Soldier', RED)):
+    START_BOARD[INDEX[_square]] = _side * KINDS[_name]
+    # Black's setup mirrors Red's across the river.
+    _mirror = _square[0] + str(11 - int(_square[1:]))
+    START_BOARD[INDEX[_mirror]] = -_side * KINDS[_name]
+
+
+class FastXiangqi:
+    """Represents a Xiangqi position as a list of 90 integers. Moves are (from index, to index) pairs internally;
+    make_move takes algebraic squares like XiangqiGame."""
+
+    def __init__(self, board=None, side=RED, game_state='UNFINISHED'):
+        """Initializes the board (the starting position by default), the side to move, and the game state."""
+        if board is None:
+            board = START_BOARD
+        self.__board = list(board)
+        self.__side = side
+        self.__game_state = game_state
+        self.__generals = {RED: self.__board.index(GENERAL), BLACK: self.__board.index(-GENERAL)}
+        self.__history = []
+
+    @classmethod
+    def from_game(cls, game):
+        """Returns a FastXiangqi holding the same position as a XiangqiGame."""
+        board = [0] * 90
+        for row in game.get_board():
+            for piece in row:
+                if piece is not None:
+                    board[INDEX[piece.get_location()]] = SIDES[piece.get_player()] * KINDS[piece.get_name()]
+        return cls(board, SIDES[game.get_player_to_move()], game.get_game_state())
+
+    def copy(self):
+        """Returns an independent copy of the position, without the move history."""
+        return FastXiangqi(self.__board, self.__side, self.__game_state)
+
+    def get_board(self):
+        """Returns the list of 90 squares"""
+        return self.__board
+
+    def get_side(self):
+        """Returns RED or BLACK, whichever side is to move"""
+        return self.__side
+
+    def get_player_to_move(self):
+        """Returns 'red' or 'black', whichever player's turn it is"""
+        return PLAYERS[self.__side]
+
+    def get_game_state(self):
+        """Returns the game state; UNFINISHED, RED_WON, or BLACK_WON"""
+        return self.__game_state
+
+    def get_hash(self):
+        """Returns the Zobrist hash of the position. It matches XiangqiGame.get_hash for the same position."""
+        key = 0 if self.__side == RED else ZOBRIST_BLACK_TO_MOVE
+        for index, piece in enumerate(self.__board):
+            if piece != 0:
+                key ^= ZOBRIST[(PLAYERS[1 if piece > 0 else -1], NAMES[abs(piece)])][SQUARES[index]]
+        return key
+
+    def is_attacked_general(self, side):
+        """Returns True if the General of the specified side could be captured, including by the other General
+        along an open column."""
+        board = self.__board
+        square = self.__generals[side]
+        enemy = -side
+
+        # Chariots, Cannons, and the facing General along the four rays.
+        for direction, ray in enumerate(INDEX_RAYS[square]):
+            screened = False
+            for index in ray:
+                piece = board[index]
+                if piece == 0:
+                    continue
+                if not screened:
+                    if piece == enemy * CHARIOT or (piece == enemy * GENERAL and direction < VERTICAL_RAYS):
+                        return True
+                    screened = True
+                else:
+                    if piece == enemy * CANNON:
+                        return True
+                    break
+
+        # Horses, unless their leg is blocked.
+        for index, leg in HORSE_ATTACKERS[square]:
+            if board[index] == enemy * HORSE and board[leg] == 0:
+                return True
+
+        # Soldiers
+        for index in SOLDIER_ATTACKERS[enemy][square]:
+            if board[index] == enemy * SOLDIER:
+                return True
+        return False
+
+    def is_in_check(self, player):
+        """Returns True if the specified player ('red' or 'black') is in check, otherwise returns False"""
+        return self.is_attacked_general(SIDES[player])
+
+    def pseudo_moves(self, side):
+        """Returns every move for the specified side that follows the piece rules, without testing for check."""
+        board = self.__board
+        moves = []
+        for square in range(90):
+            piece = board[square] * side
+            if piece <= 0:
+                continue
+            if piece == CHARIOT or piece == CANNON:
+                for ray in INDEX_RAYS[square]:
+                    screened = False
+                    for index in ray:
+                        target = board[index]
+                        if not screened:
+                            if target == 0:
+                                moves.append((square, index))
+                                continue
+                            if piece == CHARIOT:
+                                if target * side < 0:
+                                    moves.append((square, index))
+                                break
+                            screened = True
+                        elif target != 0:
+                            if target * side < 0:
+                                moves.append((square, index))
+                            break
+            else:
+                for index, block in STEPS[side][piece][square]:
+                    if board[index] * side <= 0 and (block < 0 or board[block] == 0):
+                        moves.append((square, index))
+        return moves
+
+    def play(self, move):
+        """Makes a move without checking it, and switches the side to move."""
+        square_from, square_to = move
+        board = self.__board
+        piece = board[square_from]
+        self.__history.append((square_from, square_to, board[square_to]))
+        board[square_to] = piece
+        board[square_from] = 0
+        if piece == GENERAL or piece == -GENERAL:
+            self.__generals[self.__side] = square_to
+        self.__side = -self.__side
+
+    def unplay(self):
+        """Takes back the last move made by play."""
+        square_from, square_to, captured = self.__history.pop()
+        board = self.__board
+        piece = board[square_to]
+        board[square_from] = piece
+        board[square_to] = captured
+        self.__side = -self.__side
+        if piece == GENERAL or piece == -GENERAL:
+            self.__generals[self.__side] = square_from
+
+    def is_legal(self, move):
+        """Returns True if the pseudo-legal move does not leave the mover's General in check."""
+        side = self.__side
+        self.play(move)
+        attacked = self.is_attacked_general(side)
+        self.unplay()
+        return not attacked
+
+    def legal_moves(self):
+        """Returns every legal move for the side to move."""
+        return [move for move in self.pseudo_moves(self.__side) if self.is_legal(move)]
+
+    def has_legal_move(self):
+        """Returns True as soon as a legal move is found for the side to move."""
+        for move in self.pseudo_moves(self.__side):
+            if self.is_legal(move):
+                return True
+        return False
+
+    def get_attackers(self, square):
+        """Returns the squares of the pieces of the side to move that can legally capture on square, least valuable
+        first."""
+        board = self.__board
+        side = self.__side
+        attackers = []
+        for kind, sources in REVERSE_STEPS[side].items():
+            for index, block in sources[square]:
+                if board[index] == side * kind and (block < 0 or board[block] == 0):
+                    attackers.append(index)
+
+        # Chariots reach the first piece along a ray, Cannons the piece after the screen.
+        for ray in INDEX_RAYS[square]:
+            screened = False
+            for index in ray:
+                piece = board[index]
+                if piece == 0:
+                    continue
+                if not screened:
+                    if piece == side * CHARIOT:
+                        attackers.append(index)
+                    screened = True
+                else:
+                    if piece == side * CANNON:
+                        attackers.append(index)
+                    break
+
+        attackers = [index for index in attackers if self.is_legal((index, square))]
+        attackers.sort(key=lambda index: VALUES[abs(board[index])])
+        return attackers
+
+    def see(self, move):
+        """Static exchange evaluation, as in XiangqiGame.see. Returns the material the side to move expects to win
+        by playing move when both sides keep recapturing with their least valuable piece, and either side may stop
+        once recapturing would lose material. The captures are played on the board and taken back afterwards."""
+        board = self.__board
+        square_to = move[1]
+        current = abs(board[move[0]])
+        gain = [VALUES[abs(board[square_to])]]
+        self.play(move)
+        played = 1
+        depth = 0
+        try:
+            while True:
+                # Speculative score for the side to move, if it recaptures the piece that just moved in.
+                depth += 1
+                gain.append(VALUES[current] - gain[depth - 1])
+                if max(-gain[depth - 1], gain[depth]) < 0:
+                    break
+                attackers = self.get_attackers(square_to)
+                if len(attackers) == 0:
+                    break
+                current = abs(board[attackers[0]])
+                self.play((attackers[0], square_to))
+                played += 1
+        finally:
+            for _ in range(played):
+                self.unplay()
+
+        # Each side chooses between recapturing and standing pat, from the last capture back to the first.
+        while depth > 1:
+            depth -= 1
+            gain[depth - 1] = -max(-gain[depth - 1], gain[depth])
+        return gain[0]
+
+    def make_move(self, square_from, square_to):
+        """Makes the move if it is legal, updates the game state, and returns True. Returns False if the move is
+        illegal, if it is not that piece's turn, or if the game has already been won."""
+        if self.__game_state != 'UNFINISHED' or square_from not in INDEX or square_to not in INDEX:
+            return False
+        move = (INDEX[square_from], INDEX[square_to])
+        if self.__board[move[0]] * self.__side <= 0:
+            return False
+        if move not in self.pseudo_moves(self.__side) or not self.is_legal(move):
+            return False
+        self.play(move)
+
+        # The player now to move loses if they have no legal move, by checkmate or by stalemate.
+        if not self.has_legal_move():
+            self.__game_state = 'RED_WON' if self.__side == BLACK else 'BLACK_WON'
+        return True
+
+
+def rollout(board, side, max_plies, capture_bias, rng):
+    """Plays random moves from the position until one side has no legal move or max_plies is reached. Returns the
+    winning side, or 0 if the game was cut off. With probability capture_bias, a legal capture is played when
+    one exists."""
+    position = FastXiangqi(board, side)
+    for ply in range(max_plies):
+        side = position.get_side()
+        moves = position.pseudo_moves(side)
+
+        # Lightly guided: try the captures first, most of the time.
+        if capture_bias > 0 and rng.random() < capture_bias:
+            current = position.get_board()
+            captures = [move for move in moves if current[move[1]] != 0]
+            rng.shuffle(captures)
+            for move in captures:
+                if position.is_legal(move):
+                    break
+            else:
+                move = None
+            if move is not None:
+                position.play(move)
+                continue
+
+        # Draw moves at random until one is legal; usually the first one is.
+        while moves:
+            pick = rng.randrange(len(moves))
+            move = moves[pick]
+            moves[pick] = moves[-1]
+            moves.pop()
+            if position.is_legal(move):
+                position.play(move)
+                break
+        else:
+            return -side
+    return 0
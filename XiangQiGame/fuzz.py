@@ -0,0 +1,178 @@
+# Author: Kenny Seng
+# Date: 10/19/2026
+# Description: Differential fuzzing and throughput regression harness. Seeded random games are played through
+#              XiangqiGame and every other rules implementation, comparing make_move, is_in_check, and
+#              get_game_state at every ply. A failing game is shrunk to a minimal reproducer, and each
+#              implementation's moves per second is checked against the best rate recorded in a results file.
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+from XiangqiGame import XiangqiGame, SQUARES
+from fast_rules import FastXiangqi
+
+
+def make_reference():
+    """Returns a silent XiangqiGame, the implementation every other one must agree with."""
+    return XiangqiGame(verbose=False)
+
+
+# Name -> function returning a new game in the starting position. The first entry is the reference.
+IMPLEMENTATIONS = {'XiangqiGame': make_reference, 'FastXiangqi': FastXiangqi}
+
+
+def generate_game(seed, max_plies=150, illegal_rate=0.2):
+    """Returns a seeded random sequence of moves. Most are legal moves chosen with the reference implementation;
+    about illegal_rate of them are random attempts from an occupied square, which are usually rejected."""
+    rng = random.Random(seed)
+    game = make_reference()
+    moves = []
+    while len(moves) < max_plies and game.get_game_state() == 'UNFINISHED':
+        if rng.random() < illegal_rate:
+            occupied = [square for square in SQUARES if game.get_piece(square) is not None]
+            move = (rng.choice(occupied), rng.choice(SQUARES))
+            if move[0] == move[1]:
+                continue
+        else:
+            legal = sorted(game.get_legal_moves(game.get_player_to_move()))
+            move = rng.choice(legal)
+        moves.append(move)
+        game.make_move(move[0], move[1])
+    # A move after the end of the game must be rejected by every implementation too.
+    if game.get_game_state() != 'UNFINISHED':
+        moves.append(moves[-1])
+    return moves
+
+
+def observe(game, result):
+    """Returns what is compared after each move."""
+    return result, game.is_in_check('red'), game.is_in_check('black'), game.get_game_state()
+
+
+def find_mismatch(moves, implementations):
+    """Replays the moves through every implementation. Returns (ply, {name: observation}) for the first ply
+    where they disagree, or None if they always agree. Ply 0 is the starting position."""
+    games = {name: factory() for name, factory in implementations.items()}
+    observations = {name: observe(game, None) for name, game in games.items()}
+    if len(set(observations.values())) > 1:
+        return 0, observations
+    for ply, (square_from, square_to) in enumerate(moves, 1):
+        observations = {}
+        for name, game in games.items():
+            observations[name] = observe(game, game.make_move(square_from, square_to))
+        if len(set(observations.values())) > 1:
+            return ply, observations
+    return None
+
+
+def shrink(moves, implementations):
+    """Returns a shorter move list that still makes the implementations disagree. Moves after the first
+    mismatch are cut, then chunks of moves (halving in size) are removed while the disagreement remains."""
+    mismatch = find_mismatch(moves, implementations)
+    moves = list(moves[:mismatch[0]])
+    chunk = max(1, len(moves) // 2)
+    while True:
+        start = 0
+        while start < len(moves):
+            candidate = moves[:start] + moves[start + chunk:]
+            mismatch = find_mismatch(candidate, implementations)
+            if mismatch is not None:
+                moves = candidate[:mismatch[0]]
+            else:
+                start += chunk
+        if chunk == 1:
+            return moves
+        chunk = max(1, chunk // 2)
+
+
+def measure_throughput(games, factory, repeat=1):
+    """Returns the moves per second of replaying the games through make_move alone."""
+    total = 0
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for moves in games:
+            game = factory()
+            for square_from, square_to in moves:
+                game.make_move(square_from, square_to)
+            total += len(moves)
+    elapsed = time.perf_counter() - start
+    return total / elapsed if elapsed > 0 else 0.0
+
+
+def check_throughput(rates, results_path, tolerance, update):
+    """Compares the rates with the best rates in the results file and appends this run. Returns the names of
+    implementations that are more than tolerance (a fraction) slower than their best. The best rates are only
+    raised when update is True, so a slow machine cannot lower the bar."""
+    results = {'best': {}, 'runs': []}
+    if os.path.exists(results_path):
+        with open(results_path) as results_file:
+            results = json.load(results_file)
+
+    regressions = []
+    for name, rate in rates.items():
+        best = results['best'].get(name)
+        if best is not None and rate < best * (1 - tolerance):
+            regressions.append(name)
+        if best is None or (update and rate > best):
+            results['best'][name] = rate
+    results['runs'].append({'time': time.strftime('%Y-%m-%d %H:%M:%S'), 'moves_per_second': rates,
+                            'regressions': regressions})
+
+    with open(results_path, 'w') as results_file:
+        json.dump(results, results_file, indent=2)
+    return regressions
+
+
+def run(games=100, seed=0, max_plies=150, results_path='fuzz_results.json', tolerance=0.2, update=False,
+        implementations=None):
+    """Fuzzes the implementations and measures their throughput. Returns 0 if all is well, 1 if the
+    implementations disagree, and 2 if one of them has slowed down."""
+    if implementations is None:
+        implementations = IMPLEMENTATIONS
+    move_lists = [generate_game(seed + index, max_plies) for index in range(games)]
+
+    for index, moves in enumerate(move_lists):
+        mismatch = find_mismatch(moves, implementations)
+        if mismatch is not None:
+            reproducer = shrink(moves, implementations)
+            ply, observations = find_mismatch(reproducer, implementations)
+            print('Mismatch in game with seed ' + str(seed + index) + '. Minimal reproducer (' + str(len(reproducer)) +
+                  ' moves):')
+            print('  ' + ' '.join(square_from + '-' + square_to for square_from, square_to in reproducer))
+            for name, observation in observations.items():
+                print('  ' + name + ': make_move, red in check, black in check, state = ' + str(observation))
+            return 1
+    print('All ' + str(len(implementations)) + ' implementations agree on ' + str(games) + ' games, ' +
+          str(sum(len(moves) for moves in move_lists)) + ' moves.')
+
+    rates = {}
+    for name, factory in implementations.items():
+        rates[name] = measure_throughput(move_lists, factory)
+        print('  ' + name + ': ' + str(int(rates[name])) + ' moves/sec')
+    regressions = check_throughput(rates, results_path, tolerance, update)
+    if regressions:
+        print('Throughput regression (more than ' + str(int(tolerance * 100)) + '% below best): ' +
+              ', '.join(regressions))
+        return 2
+    return 0
+
+
+def main():
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description='Differential fuzzing of Xiangqi rules implementations.')
+    parser.add_argument('--games', type=int, default=100)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--max-plies', type=int, default=150)
+    parser.add_argument('--results', default='fuzz_results.json', help='file of recorded moves/sec')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='allowed slowdown, as a fraction')
+    parser.add_argument('--update', action='store_true', help='raise the recorded best rates')
+    args = parser.parse_args()
+    sys.exit(run(args.games, args.seed, args.max_plies, args.results, args.tolerance, args.update))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,140 @@
+# Author: Kenny Seng
+# Date: 10/19/2026
+# Description: Game history with periodic checkpoints. Every move is recorded and a full snapshot of the position
+#              is kept every few plies, so jumping to any ply restores the nearest checkpoint and replays only the
+#              moves after it, while stepping one ply forward or back uses undo records.
+
+from XiangqiGame import XiangqiGame
+
+
+class GameHistory:
+    """Represents the moves of one game and a XiangqiGame showing the position at the current ply. Ply 0 is the
+    starting position and ply n is the position after n moves."""
+
+    def __init__(self, checkpoint_interval=20, game=None):
+        """Initializes an empty history starting from game (a new, silent XiangqiGame by default), keeping a
+        snapshot every checkpoint_interval plies."""
+        if game is None:
+            game = XiangqiGame(verbose=False)
+        self.__game = game
+        self.__interval = checkpoint_interval
+        self.__moves = []
+        # Game state after each ply, so replaying with do_move can restore it without checking for mate.
+        self.__states = [game.get_game_state()]
+        self.__checkpoints = {0: game.get_snapshot()}
+        self.__ply = 0
+        # Undo records for the plies from __base up to the current ply. Restoring a checkpoint resets __base.
+        self.__undo = []
+        self.__base = 0
+
+    @classmethod
+    def from_moves(cls, moves, checkpoint_interval=20):
+        """Returns a history of the given (square_from, square_to) moves, left at the last ply. Stops at the first
+        illegal move."""
+        history = cls(checkpoint_interval)
+        for square_from, square_to in moves:
+            if not history.record(square_from, square_to):
+                break
+        return history
+
+    def get_game(self):
+        """Returns the XiangqiGame showing the current ply. Use record, seek, and the step methods to change it."""
+        return self.__game
+
+    def get_ply(self):
+        """Returns the current ply"""
+        return self.__ply
+
+    def get_length(self):
+        """Returns the number of moves recorded"""
+        return len(self.__moves)
+
+    def get_moves(self):
+        """Returns the list of recorded (square_from, square_to) moves"""
+        return list(self.__moves)
+
+    def get_checkpoint_plies(self):
+        """Returns the plies that have a snapshot, in order"""
+        return sorted(self.__checkpoints)
+
+    def record(self, square_from, square_to):
+        """Plays a move at the current ply with make_move and records it. Moves that were recorded after the
+        current ply are discarded first. Returns the result of make_move."""
+        game = self.__game
+        previous_state = game.get_game_state()
+        captured = game.get_piece(square_to)
+        if not game.make_move(square_from, square_to):
+            return False
+
+        if self.__ply < len(self.__moves):
+            del self.__moves[self.__ply:]
+            del self.__states[self.__ply + 1:]
+            for ply in [ply for ply in self.__checkpoints if ply > self.__ply]:
+                del self.__checkpoints[ply]
+
+        self.__moves.append((square_from, square_to))
+        self.__states.append(game.get_game_state())
+        # The same undo record do_move would have returned, plus the state to put back.
+        self.__undo.append(((square_from, square_to, captured), previous_state))
+        self.__ply += 1
+        if self.__ply % self.__interval == 0:
+            self.__checkpoints[self.__ply] = game.get_snapshot()
+        return True
+
+    def step_forward(self):
+        """Moves to the next recorded ply. Returns False if already at the end."""
+        if self.__ply == len(self.__moves):
+            return False
+        square_from, square_to = self.__moves[self.__ply]
+        previous_state = self.__game.get_game_state()
+        self.__undo.append((self.__game.do_move(square_from, square_to), previous_state))
+        self.__ply += 1
+        self.__game.set_game_state(self.__states[self.__ply])
+        return True
+
+    def step_back(self):
+        """Moves to the previous ply. Returns False if already at the start."""
+        if self.__ply == 0:
+            return False
+        if len(self.__undo) == 0:
+            # The undo records before the last restored checkpoint are gone; seek from an earlier one instead.
+            self.seek(self.__ply - 1)
+            return True
+        record, previous_state = self.__undo.pop()
+        self.__game.undo_move(record)
+        self.__game.set_game_state(previous_state)
+        self.__ply -= 1
+        return True
+
+    def seek(self, ply):
+        """Moves to any ply from 0 to get_length(). Steps there with undo records if that is shorter, otherwise
+        restores the nearest checkpoint at or before ply and replays the rest."""
+        if not 0 <= ply <= len(self.__moves):
+            raise IndexError('ply ' + str(ply) + ' is not between 0 and ' + str(len(self.__moves)))
+        checkpoint = max(checkpoint for checkpoint in self.__checkpoints if checkpoint <= ply)
+
+        # Stepping back can only go as far as the undo records do.
+        if ply >= self.__ply:
+            steps = ply - self.__ply
+        elif ply >= self.__base:
+            steps = self.__ply - ply
+        else:
+            steps = None
+
+        if steps is None or ply - checkpoint < steps:
+            self.__game.load_snapshot(self.__checkpoints[checkpoint])
+            self.__ply = checkpoint
+            self.__base = checkpoint
+            self.__undo = []
+        while self.__ply < ply:
+            self.step_forward()
+        while self.__ply > ply:
+            self.step_back()
+
+    def to_start(self):
+        """Moves to the starting position"""
+        self.seek(0)
+
+    def to_end(self):
+        """Moves to the position after the last recorded move"""
+        self.seek(len(self.__moves))
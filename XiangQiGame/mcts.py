@@ -0,0 +1,364 @@
+# Author: Kenny Seng
+# Date: 10/19/2026
+# Description: Monte Carlo Tree Search player for Xiangqi. Leaves are chosen with UCT, their rollouts are batched
+#              and run in a process pool on the FastXiangqi rules core, and the tree is kept between moves.
+
+import math
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from fast_rules import FastXiangqi, INDEX, SQUARES, rollout
+
+
+def run_rollouts(jobs):
+    """Runs a batch of rollouts in a worker process. Each job is (board, side, max_plies, capture_bias, seed);
+    returns the winning side of each, or 0 for a game that was cut off."""
+    results = []
+    for board, side, max_plies, capture_bias, seed in jobs:
+        results.append(rollout(board, side, max_plies, capture_bias, random.Random(seed)))
+    return results
+
+
+class Node:
+    """Represents one position in the search tree, reached by playing move from the parent's position."""
+
+    def __init__(self):
+        """Initializes an empty node; NodePool.acquire fills it in."""
+        self.__parent = None
+        self.__move = None
+        self.__side_moved = 0
+        self.__children = []
+        self.__untried = None
+        self.__visits = 0
+        self.__wins = 0.0
+        self.__winner = 0
+
+    def reset(self, parent, move, side_moved):
+        """Prepares the node (new or recycled) for the position after move, played by side_moved."""
+        self.__parent = parent
+        self.__move = move
+        self.__side_moved = side_moved
+        self.__children = []
+        self.__untried = None
+        self.__visits = 0
+        self.__wins = 0.0
+        self.__winner = 0
+
+    def get_parent(self):
+        """Returns the parent node, or None for the root"""
+        return self.__parent
+
+    def set_parent(self, parent):
+        """Sets the parent node"""
+        self.__parent = parent
+
+    def get_move(self):
+        """Returns the (from index, to index) move leading to this node"""
+        return self.__move
+
+    def get_side_moved(self):
+        """Returns the side that played the move leading to this node"""
+        return self.__side_moved
+
+    def get_children(self):
+        """Returns the list of expanded children"""
+        return self.__children
+
+    def get_untried(self):
+        """Returns the legal moves not yet expanded, or None if the node has not been expanded"""
+        return self.__untried
+
+    def set_untried(self, moves):
+        """Sets the legal moves still to be expanded"""
+        self.__untried = moves
+
+    def get_visits(self):
+        """Returns the number of visits, including visits by rollouts still in flight"""
+        return self.__visits
+
+    def get_wins(self):
+        """Returns the total reward for the side that moved into this node"""
+        return self.__wins
+
+    def get_winner(self):
+        """Returns the side that wins if the node is a finished game or a proven win or loss, otherwise 0"""
+        return self.__winner
+
+    def set_winner(self, side):
+        """Marks the node as won by side, either because the game is over or because it has been proven"""
+        self.__winner = side
+
+    def add_visit(self):
+        """Counts a visit. Visits are added on the way down, so leaves waiting on a rollout are less attractive to
+        the rest of the batch (a virtual loss)."""
+        self.__visits += 1
+
+    def add_reward(self, reward):
+        """Adds a rollout reward: 1 for a win, 0.5 for a cut-off game, 0 for a loss."""
+        self.__wins += reward
+
+    def uct(self, log_parent_visits, exploration):
+        """Returns the UCT score used to choose between siblings."""
+        if self.__visits == 0:
+            return math.inf
+        return self.__wins / self.__visits + exploration * math.sqrt(log_parent_visits / self.__visits)
+
+
+class NodePool:
+    """Hands out Node objects and takes back the nodes of discarded subtrees, so the tree never holds more than
+    max_nodes nodes and old nodes are reused instead of reallocated."""
+
+    def __init__(self, max_nodes):
+        """Initializes an empty pool allowing at most max_nodes nodes in use."""
+        self.__max_nodes = max_nodes
+        self.__free = []
+        self.__in_use = 0
+
+    def get_in_use(self):
+        """Returns the number of nodes currently in the tree"""
+        return self.__in_use
+
+    def is_full(self):
+        """Returns True once the memory cap has been reached"""
+        return self.__in_use >= self.__max_nodes
+
+    def acquire(self, parent, move, side_moved):
+        """Returns a node for the position after move, recycling a freed node when one is available."""
+        if self.__free:
+            node = self.__free.pop()
+        else:
+            node = Node()
+        node.reset(parent, move, side_moved)
+        self.__in_use += 1
+        return node
+
+    def release(self, node):
+        """Returns node and its whole subtree to the pool."""
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            stack.extend(current.get_children())
+            current.reset(None, None, 0)
+            self.__free.append(current)
+            self.__in_use -= 1
+
+
+class MCTSPlayer:
+    """Chooses moves with Monte Carlo Tree Search. Rollouts run in a pool of worker processes, or in this process
+    when workers is 0. The tree is kept between moves, so call close() when done to stop the workers."""
+
+    def __init__(self, workers=0, batch_size=32, exploration=1.4, max_nodes=200000, max_plies=200,
+                 capture_bias=0.5, seed=None):
+        """Initializes the search settings. capture_bias is the chance that a rollout plays a capture when one
+        exists (0 for purely random rollouts)."""
+        self.__workers = workers
+        self.__batch_size = batch_size
+        self.__exploration = exploration
+        self.__max_plies = max_plies
+        self.__capture_bias = capture_bias
+        self.__rng = random.Random(seed)
+        self.__pool = NodePool(max_nodes)
+        self.__executor = None
+        self.__root = None
+        self.__root_position = None
+        self.__playouts = 0
+        self.__elapsed = 0.0
+
+    def close(self):
+        """Shuts down the worker processes"""
+        if self.__executor is not None:
+            self.__executor.shutdown()
+            self.__executor = None
+
+    def get_playouts(self):
+        """Returns the number of rollouts in the last search"""
+        return self.__playouts
+
+    def get_playouts_per_second(self):
+        """Returns the rollout rate of the last search"""
+        if self.__elapsed == 0:
+            return 0.0
+        return self.__playouts / self.__elapsed
+
+    def get_tree_size(self):
+        """Returns the number of nodes in the tree"""
+        return self.__pool.get_in_use()
+
+    def get_root(self):
+        """Returns the root node of the tree"""
+        return self.__root
+
+    def choose_move(self, game, playouts=None, seconds=None):
+        """Searches the position of a XiangqiGame (or FastXiangqi) and returns the best (square_from, square_to)
+        move, or None if there is no legal move. Stops after the given number of playouts or seconds, or as soon
+        as the result of the position has been proven."""
+        if playouts is None and seconds is None:
+            playouts = 1000
+        if not isinstance(game, FastXiangqi):
+            game = FastXiangqi.from_game(game)
+        self.set_position(game)
+
+        start = time.perf_counter()
+        self.__playouts = 0
+        while True:
+            if playouts is not None and self.__playouts >= playouts:
+                break
+            if seconds is not None and time.perf_counter() - start >= seconds:
+                break
+            if not self.run_batch():
+                break
+        self.__elapsed = time.perf_counter() - start
+
+        children = self.__root.get_children()
+        if not children:
+            return None
+        # A proven win is played at once; a proven loss only if every move loses.
+        winning = [child for child in children if child.get_winner() == child.get_side_moved()]
+        if winning:
+            best = max(winning, key=lambda child: child.get_visits())
+        else:
+            candidates = [child for child in children if child.get_winner() == 0] or children
+            best = max(candidates, key=lambda child: child.get_visits())
+        return SQUARES[best.get_move()[0]], SQUARES[best.get_move()[1]]
+
+    def set_position(self, position):
+        """Makes position the root of the tree. If it is the current root, or was reached from it by one or two
+        moves (ours, then the opponent's), that subtree is kept and the rest of the tree is recycled."""
+        key = position.get_hash()
+        if self.__root is not None:
+            if self.__root_position.get_hash() == key:
+                return
+            for child in self.__root.get_children():
+                after_child = self.__root_position.copy()
+                after_child.play(child.get_move())
+                if after_child.get_hash() == key:
+                    self.advance(child.get_move())
+                    return
+                for grandchild in child.get_children():
+                    after_grandchild = after_child.copy()
+                    after_grandchild.play(grandchild.get_move())
+                    if after_grandchild.get_hash() == key:
+                        self.advance(child.get_move())
+                        self.advance(grandchild.get_move())
+                        return
+            self.__pool.release(self.__root)
+        self.__root = self.__pool.acquire(None, None, -position.get_side())
+        self.__root_position = position.copy()
+
+    def advance(self, move):
+        """Moves the root to the child reached by move, recycling every other branch. move may be a pair of
+        square indexes or of algebraic squares."""
+        if isinstance(move[0], str):
+            move = (INDEX[move[0]], INDEX[move[1]])
+        new_root = None
+        for child in self.__root.get_children():
+            if child.get_move() == move:
+                new_root = child
+        if new_root is None:
+            new_root = self.__pool.acquire(None, move, self.__root_position.get_side())
+        else:
+            self.__root.get_children().remove(new_root)
+        self.__pool.release(self.__root)
+        new_root.set_parent(None)
+        self.__root = new_root
+        self.__root_position.play(move)
+        self.__root_position = self.__root_position.copy()
+
+    def select(self):
+        """Walks down the tree by UCT from the root, expanding one new child if the memory cap allows. Returns the
+        path of nodes and the position at its end."""
+        node = self.__root
+        position = self.__root_position.copy()
+        node.add_visit()
+        path = [node]
+        while node.get_winner() == 0:
+            if node.get_untried() is None:
+                moves = position.legal_moves()
+                self.__rng.shuffle(moves)
+                node.set_untried(moves)
+                if len(moves) == 0:
+                    # No legal move: checkmate or stalemate, and either way the side to move has lost.
+                    node.set_winner(-position.get_side())
+                    break
+
+            untried = node.get_untried()
+            if untried and not self.__pool.is_full():
+                move = untried.pop()
+                child = self.__pool.acquire(node, move, position.get_side())
+                node.get_children().append(child)
+                position.play(move)
+                child.add_visit()
+                path.append(child)
+                break
+            if not node.get_children():
+                break
+
+            # Children proven lost for the side to move are skipped while any other move is left.
+            children = [child for child in node.get_children() if child.get_winner() == 0] or node.get_children()
+            log_visits = math.log(node.get_visits())
+            node = max(children, key=lambda child: child.uct(log_visits, self.__exploration))
+            position.play(node.get_move())
+            node.add_visit()
+            path.append(node)
+        return path, position
+
+    def run_batch(self):
+        """Selects a batch of leaves, runs their rollouts, and backs the results up the tree. Returns False if
+        the result of the root has been proven. A leaf that is already decided counts as a playout without a
+        rollout."""
+        paths = []
+        jobs = []
+        for _ in range(self.__batch_size):
+            path, position = self.select()
+            leaf = path[-1]
+            if leaf.get_winner() != 0:
+                self.prove(leaf)
+                self.backpropagate(path, leaf.get_winner())
+                self.__playouts += 1
+                if self.__root.get_winner() != 0:
+                    return False
+                continue
+            paths.append(path)
+            jobs.append((position.get_board(), position.get_side(), self.__max_plies, self.__capture_bias,
+                         self.__rng.getrandbits(32)))
+
+        for path, winner in zip(paths, self.run_jobs(jobs)):
+            self.backpropagate(path, winner)
+        self.__playouts += len(jobs)
+        return True
+
+    def prove(self, node):
+        """Passes a decided node's result up the tree. A parent is won for the side to move there if any move
+        wins, and lost if every move has been expanded and loses."""
+        while node.get_parent() is not None:
+            parent = node.get_parent()
+            winner = node.get_winner()
+            if winner != node.get_side_moved():
+                if parent.get_untried() or any(child.get_winner() != winner for child in parent.get_children()):
+                    return
+            if parent.get_winner() == winner:
+                return
+            parent.set_winner(winner)
+            node = parent
+
+    def run_jobs(self, jobs):
+        """Runs rollouts in this process, or split evenly across the worker processes."""
+        if self.__workers == 0 or len(jobs) < 2:
+            return run_rollouts(jobs)
+        if self.__executor is None:
+            self.__executor = ProcessPoolExecutor(self.__workers)
+        size = max(1, -(-len(jobs) // self.__workers))
+        chunks = [jobs[start:start + size] for start in range(0, len(jobs), size)]
+        results = []
+        for chunk_results in self.__executor.map(run_rollouts, chunks):
+            results.extend(chunk_results)
+        return results
+
+    def backpropagate(self, path, winner):
+        """Credits each node on the path from the point of view of the side that moved into it."""
+        for node in path:
+            if winner == 0:
+                node.add_reward(0.5)
+            elif winner == node.get_side_moved():
+                node.add_reward(1.0)
@@ -0,0 +1,205 @@
+# Author: Kenny Seng
+# Date: 10/19/2026
+# Description: A local SQLite index of every position reached in a set of game archives. Each row records the
+#              position hash, the game, the ply, the move played next, and the game's result, so questions like
+#              "which games reached this position, and how did they score" are a single indexed lookup.
+
+import argparse
+import sqlite3
+
+from archive import format_move, parse_move, read_archive
+from fast_rules import FastXiangqi
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (game_id TEXT PRIMARY KEY, result TEXT, plies INTEGER, complete INTEGER);
+CREATE TABLE IF NOT EXISTS positions (hash INTEGER, game_id TEXT, ply INTEGER, next_move TEXT, result TEXT);
+CREATE INDEX IF NOT EXISTS positions_by_hash ON positions (hash);
+"""
+
+
+class PositionHit:
+    """Represents one occurrence of a position in the archive."""
+
+    def __init__(self, game_id, ply, next_move, result):
+        """Initializes the game id, the ply (0 before the first move), the move played next (None at the end of
+        the game), and the game's result."""
+        self.__game_id = game_id
+        self.__ply = ply
+        self.__next_move = next_move
+        self.__result = result
+
+    def get_game_id(self):
+        """Returns the id of the game"""
+        return self.__game_id
+
+    def get_ply(self):
+        """Returns the number of moves played before the position was reached"""
+        return self.__ply
+
+    def get_next_move(self):
+        """Returns the move played from the position as 'h3-e3', or None if the game ended there"""
+        return self.__next_move
+
+    def get_result(self):
+        """Returns the game's result; UNFINISHED, RED_WON, or BLACK_WON"""
+        return self.__result
+
+
+class PositionIndex:
+    """Represents the position index stored in a SQLite database file."""
+
+    def __init__(self, path, batch_size=10000):
+        """Opens (or creates) the index at path. Rows are inserted batch_size at a time."""
+        self.__connection = sqlite3.connect(path)
+        self.__connection.executescript(SCHEMA)
+        self.__batch_size = batch_size
+
+    def close(self):
+        """Closes the database"""
+        self.__connection.close()
+
+    def get_game_count(self):
+        """Returns the number of games in the index"""
+        return self.__connection.execute('SELECT COUNT(*) FROM games').fetchone()[0]
+
+    def has_game(self, game_id):
+        """Returns True if the game has already been indexed"""
+        row = self.__connection.execute('SELECT 1 FROM games WHERE game_id = ?', (game_id,)).fetchone()
+        return row is not None
+
+    def index_archives(self, paths):
+        """Streams the archives through the rules engine and indexes every game not already in the index.
+        Returns the number of games added. A game with an illegal move is indexed up to that move and marked
+        incomplete."""
+        connection = self.__connection
+        # The index can always be rebuilt from the archives, so durability is traded for insert speed.
+        connection.execute('PRAGMA synchronous = OFF')
+        connection.execute('PRAGMA journal_mode = MEMORY')
+
+        added = 0
+        rows = []
+        for game in read_archive(paths):
+            if self.has_game(game.get_game_id()):
+                continue
+            game_rows, result, complete = replay(game)
+            rows.extend(game_rows)
+            connection.execute('INSERT INTO games VALUES (?, ?, ?, ?)',
+                               (game.get_game_id(), result, len(game_rows) - 1, int(complete)))
+            added += 1
+            if len(rows) >= self.__batch_size:
+                self.insert_positions(rows)
+                rows = []
+        self.insert_positions(rows)
+        return added
+
+    def insert_positions(self, rows):
+        """Inserts position rows and commits, along with the games recorded since the last commit."""
+        self.__connection.executemany('INSERT INTO positions VALUES (?, ?, ?, ?, ?)', rows)
+        self.__connection.commit()
+
+    def lookup(self, position):
+        """Returns a PositionHit for every time the position was reached. position may be a XiangqiGame, a
+        FastXiangqi, or a hash from get_hash()."""
+        cursor = self.__connection.execute(
+            'SELECT game_id, ply, next_move, result FROM positions WHERE hash = ? ORDER BY game_id, ply',
+            (position_key(position),))
+        return [PositionHit(game_id, ply, next_move, result) for game_id, ply, next_move, result in cursor]
+
+    def get_stats(self, position):
+        """Returns how the games that reached the position scored, overall and for each move played from it:
+        {'games': n, 'RED_WON': n, 'BLACK_WON': n, 'UNFINISHED': n, 'moves': {'h3-e3': {...}, ...}}
+        Each game is counted once overall, even if it reached the position more than once."""
+        key = position_key(position)
+        stats = new_score()
+        stats['moves'] = {}
+        cursor = self.__connection.execute(
+            'SELECT result, COUNT(DISTINCT game_id) FROM positions WHERE hash = ? GROUP BY result', (key,))
+        for result, count in cursor:
+            add_score(stats, result, count)
+
+        cursor = self.__connection.execute(
+            'SELECT next_move, result, COUNT(DISTINCT game_id) FROM positions WHERE hash = ? '
+            'GROUP BY next_move, result', (key,))
+        for next_move, result, count in cursor:
+            if next_move is not None:
+                if next_move not in stats['moves']:
+                    stats['moves'][next_move] = new_score()
+                add_score(stats['moves'][next_move], result, count)
+        return stats
+
+
+def new_score():
+    """Returns an empty score count"""
+    return {'games': 0, 'RED_WON': 0, 'BLACK_WON': 0, 'UNFINISHED': 0}
+
+
+def add_score(score, result, count):
+    """Adds count games with the given result to a score count"""
+    score['games'] += count
+    score[result] = score.get(result, 0) + count
+
+
+def position_key(position):
+    """Returns the hash for a XiangqiGame, a FastXiangqi, or a hash that is passed in directly."""
+    if isinstance(position, int):
+        return position
+    return position.get_hash()
+
+
+def replay(game):
+    """Replays an ArchivedGame silently. Returns the position rows, the result, and whether every move was legal.
+    The recorded result is used if there is one, otherwise the state the game reached."""
+    position = FastXiangqi()
+    hashes = [position.get_hash()]
+    played = []
+    complete = True
+    for square_from, square_to in game.get_moves():
+        if not position.make_move(square_from, square_to):
+            complete = False
+            break
+        played.append(format_move((square_from, square_to)))
+        hashes.append(position.get_hash())
+
+    result = game.get_result()
+    if result is None:
+        result = position.get_game_state()
+    rows = []
+    for ply, key in enumerate(hashes):
+        next_move = played[ply] if ply < len(played) else None
+        rows.append((key, game.get_game_id(), ply, next_move, result))
+    return rows, result, complete
+
+
+def main():
+    """Command line: index archives into a database, or look up the position after a list of moves."""
+    parser = argparse.ArgumentParser(description='Index Xiangqi game archives by position.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    index_command = commands.add_parser('index', help='add new games from archives to the index')
+    index_command.add_argument('database')
+    index_command.add_argument('archives', nargs='+')
+    query_command = commands.add_parser('query', help='look up the position after the given moves')
+    query_command.add_argument('database')
+    query_command.add_argument('moves', nargs='*', help="moves such as h3-e3")
+    args = parser.parse_args()
+
+    index = PositionIndex(args.database)
+    if args.command == 'index':
+        print('Indexed ' + str(index.index_archives(args.archives)) + ' new games; ' +
+              str(index.get_game_count()) + ' in total.')
+    else:
+        position = FastXiangqi()
+        for move in args.moves:
+            try:
+                square_from, square_to = parse_move(move)
+            except ValueError:
+                parser.error('malformed move ' + move)
+            if not position.make_move(square_from, square_to):
+                parser.error('illegal move ' + move)
+        for hit in index.lookup(position):
+            print(hit.get_game_id(), hit.get_ply(), hit.get_next_move(), hit.get_result())
+        print(index.get_stats(position))
+    index.close()
+
+
+if __name__ == '__main__':
+    main()
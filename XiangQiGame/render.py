@@ -0,0 +1,230 @@
+# Author: Kenny Seng
+# Date: 10/19/2026
+# Description: Terminal renderers that redraw only what changed. A BoardRenderer caches the text of every square
+#              and row, and after the first full frame it moves the cursor with ANSI escape codes to rewrite just
+#              the squares that changed. A MultiBoardRenderer tiles many boards and sends all of their changes in
+#              one write, at most once per interval. Lines are padded with spaces rather than cleared to the end of
+#              the terminal line, so a board never erases the boards beside it.
+
+import sys
+import time
+
+from fast_rules import FastXiangqi, NAMES, PLAYERS
+
+# Unicode glyphs; Red and Black traditionally use different characters for most pieces. They are two columns
+# wide in a terminal, the same as the two-letter plain abbreviations.
+GLYPHS = {'red': {'General': '帥', 'Advisor': '仕', 'Elephant': '相', 'Horse': '傌', 'RChariot': '俥',
+                  'Cannon': '炮', 'Soldier': '兵'},
+          'black': {'General': '將', 'Advisor': '士', 'Elephant': '象', 'Horse': '馬', 'RChariot': '車',
+                    'Cannon': '砲', 'Soldier': '卒'}}
+
+RED_COLOR = '\x1b[31m'
+BLACK_COLOR = '\x1b[1m'
+RESET = '\x1b[0m'
+
+# Each square is three columns wide, after a three column row label.
+CELL_WIDTH = 3
+LABEL_WIDTH = 3
+BOARD_WIDTH = LABEL_WIDTH + 9 * CELL_WIDTH
+# Column letters, ten rows, and the status line. A message line (see BoardRenderer.show_message) sits just below.
+BOARD_HEIGHT = 12
+
+
+def move_cursor(line, column):
+    """Returns the ANSI code that moves the cursor to a 1-based line and column."""
+    return '\x1b[' + str(line) + ';' + str(column) + 'H'
+
+
+def read_squares(game):
+    """Returns the 90 squares of a XiangqiGame or FastXiangqi as (player, name) pairs or None, in the order
+    a1..i1, a2..i2, and so on, plus a status line."""
+    squares = []
+    if isinstance(game, FastXiangqi):
+        for piece in game.get_board():
+            if piece == 0:
+                squares.append(None)
+            else:
+                squares.append((PLAYERS[1 if piece > 0 else -1], NAMES[abs(piece)]))
+    else:
+        for row in game.get_board():
+            for piece in row:
+                squares.append(None if piece is None else (piece.get_player(), piece.get_name()))
+
+    if game.get_game_state() != 'UNFINISHED':
+        status = game.get_game_state()
+    elif game.get_player_to_move() == 'red':
+        status = "Red's turn"
+    else:
+        status = "Black's turn"
+    return squares, status
+
+
+class BoardRenderer:
+    """Draws one board at a fixed place on the terminal. The first frame is drawn in full; after that only the
+    squares and status line that changed are rewritten. Every line stays within BOARD_WIDTH columns, except the
+    message line below the board."""
+
+    def __init__(self, stream=None, unicode=False, color=None, top=1, left=1):
+        """Initializes the output stream (stdout by default), the glyph mode, and the board's top-left corner.
+        Color defaults to on in Unicode mode and off in plain mode."""
+        self.__stream = stream
+        self.__unicode = unicode
+        self.__color = unicode if color is None else color
+        self.__top = top
+        self.__left = left
+        self.__cells = [None] * 90
+        self.__rows = [None] * 10
+        self.__status = None
+        self.__message = ''
+        self.__drawn = False
+
+    def invalidate(self):
+        """Forces a full redraw on the next frame, e.g. after the screen was cleared"""
+        self.__drawn = False
+
+    def get_cell_text(self, square):
+        """Returns the text for one square, always CELL_WIDTH columns wide"""
+        if square is None:
+            return ' . ' if self.__unicode else '   '
+        player, name = square
+        if self.__unicode:
+            text = ' ' + GLYPHS[player][name]
+        else:
+            text = ' ' + player[0] + name[0]
+        if self.__color:
+            text = (RED_COLOR if player == 'red' else BLACK_COLOR) + text + RESET
+        return text
+
+    def get_row_text(self, row):
+        """Returns the cached text of a row (1-10), rebuilding it only if one of its squares changed"""
+        if self.__rows[row - 1] is None:
+            self.__rows[row - 1] = str(row).rjust(2) + ' ' + ''.join(self.__cells[(row - 1) * 9:row * 9])
+        return self.__rows[row - 1]
+
+    def get_text(self):
+        """Returns the last frame as plain lines, without cursor movement. Each line is BOARD_WIDTH columns."""
+        lines = [' ' * LABEL_WIDTH + ''.join(' ' + chr(col + 97) + ' ' for col in range(9))]
+        for row in range(1, 11):
+            lines.append(self.get_row_text(row))
+        lines.append(self.get_status_text(self.__status or ''))
+        return '\n'.join(lines)
+
+    def get_status_text(self, status):
+        """Returns the status padded (or cut) to BOARD_WIDTH, so it covers the old status and nothing more"""
+        return status[:BOARD_WIDTH].ljust(BOARD_WIDTH)
+
+    def get_message(self):
+        """Returns the message shown below the board"""
+        return self.__message
+
+    def draw_message(self, message):
+        """Records the message shown below the board and returns the text that writes it, padded to cover the
+        previous message. Returns an empty string until the first frame has been drawn."""
+        width = max(len(message), len(self.__message))
+        self.__message = message
+        if not self.__drawn:
+            return ''
+        return move_cursor(self.__top + BOARD_HEIGHT, self.__left) + message.ljust(width)
+
+    def show_message(self, message):
+        """Writes a message, such as a move report from XiangqiGame, on the line below the board at once, so it
+        is not printed over the board"""
+        output = self.draw_message(message)
+        if output:
+            self.write(output)
+
+    def draw(self, squares, status):
+        """Updates the cache from the squares and status (see read_squares) and returns the text that brings
+        the terminal up to date. Returns an empty string if nothing changed."""
+        changed = []
+        for index in range(90):
+            text = self.get_cell_text(squares[index])
+            if text != self.__cells[index]:
+                self.__cells[index] = text
+                self.__rows[index // 9] = None
+                changed.append(index)
+        status_changed = status != self.__status
+        self.__status = status
+
+        # First frame: every line, each written at its own position so the board can sit anywhere on screen.
+        if not self.__drawn:
+            self.__drawn = True
+            parts = []
+            for offset, line in enumerate(self.get_text().split('\n')):
+                parts.append(move_cursor(self.__top + offset, self.__left) + line)
+            if self.__message:
+                parts.append(move_cursor(self.__top + BOARD_HEIGHT, self.__left) + self.__message)
+            return ''.join(parts)
+
+        parts = []
+        for index in changed:
+            line = self.__top + 1 + index // 9
+            column = self.__left + LABEL_WIDTH + (index % 9) * CELL_WIDTH
+            parts.append(move_cursor(line, column) + self.__cells[index])
+        if status_changed:
+            parts.append(move_cursor(self.__top + 11, self.__left) + self.get_status_text(status))
+        return ''.join(parts)
+
+    def render(self, game):
+        """Draws the game's changes on the stream, as a single write"""
+        output = self.draw(*read_squares(game))
+        if output:
+            self.write(output)
+
+    def write(self, output):
+        """Writes and flushes output on the stream"""
+        stream = self.__stream if self.__stream is not None else sys.stdout
+        stream.write(output)
+        stream.flush()
+
+
+class MultiBoardRenderer:
+    """Draws many boards in a grid. update() only records a board's latest position; flush() writes the changes
+    of every board in one write, and does nothing if called again within min_interval seconds, so a fast stream
+    of moves across many games is coalesced into a steady frame rate."""
+
+    def __init__(self, stream=None, columns=4, unicode=False, color=None, min_interval=0.1, top=1, left=1):
+        """Initializes the stream, the number of boards per line of the grid, the glyph mode, and the interval."""
+        self.__stream = stream
+        self.__columns = columns
+        self.__unicode = unicode
+        self.__color = color
+        self.__min_interval = min_interval
+        self.__top = top
+        self.__left = left
+        self.__renderers = {}
+        self.__pending = {}
+        self.__last_flush = None
+
+    def get_board_count(self):
+        """Returns the number of boards in the grid"""
+        return len(self.__renderers)
+
+    def update(self, key, game):
+        """Records the latest position of the board identified by key, adding it to the grid if it is new. The
+        position is copied, so the game may keep changing before the next flush."""
+        if key not in self.__renderers:
+            slot = len(self.__renderers)
+            top = self.__top + (slot // self.__columns) * (BOARD_HEIGHT + 1)
+            left = self.__left + (slot % self.__columns) * (BOARD_WIDTH + 2)
+            self.__renderers[key] = BoardRenderer(None, self.__unicode, self.__color, top, left)
+        self.__pending[key] = read_squares(game)
+
+    def flush(self, force=False):
+        """Writes every board's changes since the last flush in one write. Returns False if skipped because the
+        last flush was less than min_interval ago (unless force is set) or if there was nothing to draw."""
+        now = time.monotonic()
+        if not force and self.__last_flush is not None and now - self.__last_flush < self.__min_interval:
+            return False
+        parts = []
+        for key, (squares, status) in self.__pending.items():
+            parts.append(self.__renderers[key].draw(squares, status))
+        self.__pending = {}
+        output = ''.join(parts)
+        if not output:
+            return False
+        self.__last_flush = now
+        stream = self.__stream if self.__stream is not None else sys.stdout
+        stream.write(output)
+        stream.flush()
+        return True
@@ -0,0 +1,268 @@
+# Author: Kenny Seng
+# Date: 10/19/2026
+# Description: Regression tests for XiangqiGame's rules, using small hand-made positions: Chariot and Cannon checks
+#              along rows, Cannons that may not slide through pieces, check evasions, checkmate, and stalemate.
+#              Also tests the PositionCache, on its own and through the game queries that use it, and static
+#              exchange evaluation on both XiangqiGame and FastXiangqi.
+
+import unittest
+
+from XiangqiGame import XiangqiGame, PositionCache, MISSING, SQUARES, Chariot
+from fast_rules import FastXiangqi, INDEX
+
+
+def make_game(pieces, player='red'):
+    """Returns a silent XiangqiGame with only the given (location, player, name) pieces, with player to move."""
+    game = XiangqiGame(verbose=False)
+    game.load_snapshot((tuple(pieces), 1 if player == 'red' else 2, 'UNFINISHED'))
+    return game
+
+
+def brute_force_moves(game, player):
+    """Returns every legal move for player by trying every pair of squares with is_legal_move."""
+    moves = set()
+    for square_from in SQUARES:
+        piece = game.get_piece(square_from)
+        if piece is not None and piece.get_player() == player:
+            for square_to in SQUARES:
+                if square_to != square_from and game.is_legal_move(square_from, square_to):
+                    moves.add((square_from, square_to))
+    return moves
+
+
+class CheckTest(unittest.TestCase):
+    """Chariot and Cannon checks along the General's row, from either side."""
+
+    def test_chariot_checks_along_row(self):
+        for chariot in ('a1', 'i1'):
+            game = make_game([('d1', 'red', 'General'), ('f10', 'black', 'General'),
+                              (chariot, 'black', 'RChariot')])
+            self.assertTrue(game.is_in_check('red'), chariot)
+
+    def test_chariot_blocked_along_row(self):
+        game = make_game([('d1', 'red', 'General'), ('f10', 'black', 'General'), ('a1', 'black', 'RChariot'),
+                          ('b1', 'red', 'Horse')])
+        self.assertFalse(game.is_in_check('red'))
+
+    def test_cannon_checks_over_one_screen(self):
+        for cannon, screen in (('a1', 'b1'), ('i1', 'f1')):
+            game = make_game([('d1', 'red', 'General'), ('f10', 'black', 'General'), (cannon, 'black', 'Cannon'),
+                              (screen, 'red', 'Advisor')])
+            self.assertTrue(game.is_in_check('red'), cannon)
+
+    def test_cannon_needs_exactly_one_screen(self):
+        no_screen = make_game([('d1', 'red', 'General'), ('f10', 'black', 'General'), ('a1', 'black', 'Cannon')])
+        self.assertFalse(no_screen.is_in_check('red'))
+        two_screens = make_game([('d1', 'red', 'General'), ('f10', 'black', 'General'), ('a1', 'black', 'Cannon'),
+                                 ('b1', 'red', 'Horse'), ('c1', 'black', 'Elephant')])
+        self.assertFalse(two_screens.is_in_check('red'))
+
+
+class CannonMoveTest(unittest.TestCase):
+    """A Cannon may jump a single piece only to capture."""
+
+    def test_cannon_cannot_slide_through_pieces(self):
+        game = make_game([('e1', 'red', 'General'), ('d10', 'black', 'General'), ('b3', 'red', 'Cannon'),
+                          ('b5', 'black', 'Soldier')])
+        self.assertIsNotNone(game.get_move_error('b3', 'b7'))
+        self.assertFalse(game.make_move('b3', 'b7'))
+
+    def test_cannon_captures_over_screen(self):
+        game = make_game([('e1', 'red', 'General'), ('d10', 'black', 'General'), ('b3', 'red', 'Cannon'),
+                          ('b5', 'black', 'Soldier'), ('b7', 'black', 'Horse')])
+        self.assertTrue(game.make_move('b3', 'b7'))
+
+
+class OffBoardTest(unittest.TestCase):
+    """Squares off the board are refused, not wrapped around or looked up past the edge."""
+
+    def test_off_board_squares_rejected(self):
+        game = XiangqiGame(verbose=False)
+        for square_from, square_to in (('a0', 'a1'), ('a1', 'a0'), ('j1', 'i1'), ('a10', 'a11'), ('e', 'e2')):
+            self.assertIsNotNone(game.get_move_error(square_from, square_to))
+            self.assertFalse(game.is_legal_move(square_from, square_to))
+            self.assertFalse(game.make_move(square_from, square_to))
+        self.assertEqual(game.get_player_to_move(), 'red')
+        self.assertTrue(game.make_move('a1', 'a2'))
+
+
+class EvasionTest(unittest.TestCase):
+    """get_evasions must return exactly the legal moves when in check."""
+
+    def assert_evasions_complete(self, game, player):
+        self.assertTrue(game.is_in_check(player))
+        self.assertEqual(set(game.get_evasions(player)), brute_force_moves(game, player))
+        self.assertEqual(set(game.get_legal_moves(player)), brute_force_moves(game, player))
+
+    def test_chariot_check(self):
+        # Block on e2-e9, capture on e10 with the Horse, or step the General aside.
+        game = make_game([('e1', 'red', 'General'), ('f10', 'black', 'General'), ('e10', 'black', 'RChariot'),
+                          ('a5', 'red', 'RChariot'), ('g9', 'red', 'Horse'), ('d1', 'red', 'Advisor')])
+        self.assert_evasions_complete(game, 'red')
+
+    def test_cannon_check_moving_screen(self):
+        game = make_game([('e1', 'red', 'General'), ('d10', 'black', 'General'), ('e8', 'black', 'Cannon'),
+                          ('e4', 'red', 'Horse'), ('a3', 'red', 'RChariot')])
+        self.assert_evasions_complete(game, 'red')
+
+    def test_double_check(self):
+        game = make_game([('e1', 'red', 'General'), ('d10', 'black', 'General'), ('e9', 'black', 'RChariot'),
+                          ('f3', 'black', 'Horse'), ('a9', 'red', 'RChariot'), ('b2', 'red', 'Cannon')])
+        self.assert_evasions_complete(game, 'red')
+
+
+class GameEndTest(unittest.TestCase):
+    """Checkmate and stalemate both end the game in favour of the player who made the last move."""
+
+    def test_checkmate(self):
+        # Chariot to the back row while the other Chariot covers row 9.
+        game = make_game([('f1', 'red', 'General'), ('d10', 'black', 'General'), ('b9', 'red', 'RChariot'),
+                          ('a1', 'red', 'RChariot')])
+        self.assertTrue(game.make_move('a1', 'a10'))
+        self.assertTrue(game.is_checkmate('black'))
+        self.assertEqual(game.get_game_state(), 'RED_WON')
+
+    def test_stalemate_loses(self):
+        # Black is not in check, but the General has nowhere to go once row 9 is covered.
+        game = make_game([('d1', 'red', 'General'), ('e10', 'black', 'General'), ('d2', 'red', 'RChariot'),
+                          ('f2', 'red', 'RChariot'), ('a8', 'red', 'RChariot')])
+        self.assertTrue(game.has_legal_move('black'))
+        self.assertTrue(game.make_move('a8', 'a9'))
+        self.assertFalse(game.is_in_check('black'))
+        self.assertFalse(game.is_checkmate('black'))
+        self.assertTrue(game.is_stalemate('black'))
+        self.assertEqual(game.get_game_state(), 'RED_WON')
+
+    def test_no_moves_after_game_ends(self):
+        game = make_game([('d1', 'red', 'General'), ('e10', 'black', 'General'), ('d2', 'red', 'RChariot'),
+                          ('f2', 'red', 'RChariot'), ('a8', 'red', 'RChariot')])
+        game.make_move('a8', 'a9')
+        self.assertFalse(game.make_move('e10', 'e9'))
+
+
+
+class PositionCacheTest(unittest.TestCase):
+    """The cache evicts the least recently used result, counts hits and misses, and never returns a result for a
+    position other than the current one."""
+
+    def test_least_recently_used_evicted(self):
+        cache = PositionCache(2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        self.assertEqual(cache.get('a'), 1)
+        cache.put('c', 3)
+        self.assertIs(cache.get('b'), MISSING)
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache.get('c'), 3)
+
+    def test_hits_and_misses_counted(self):
+        cache = PositionCache(4)
+        self.assertIs(cache.get('a'), MISSING)
+        cache.put('a', False)
+        self.assertIs(cache.get('a'), False)
+        self.assertIs(cache.get('a'), False)
+        stats = cache.get_stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['size']), (2, 1, 1))
+        self.assertAlmostEqual(stats['hit_rate'], 2 / 3)
+        cache.clear()
+        self.assertEqual(cache.get_stats()['hits'], 0)
+        self.assertEqual(cache.get_stats()['size'], 0)
+
+    def test_size_zero_stores_nothing(self):
+        game = XiangqiGame(verbose=False, cache_size=0)
+        for _ in range(2):
+            self.assertEqual(set(game.get_legal_moves('red')), brute_force_moves(game, 'red'))
+        self.assertEqual(game.get_cache().get_stats()['size'], 0)
+        self.assertEqual(game.get_cache().get_stats()['hits'], 0)
+
+    def test_repeated_query_hits(self):
+        game = XiangqiGame(verbose=False)
+        game.is_in_check('red')
+        game.is_in_check('red')
+        self.assertEqual(game.get_cache().get_stats()['hits'], 1)
+
+    def test_set_piece_changes_result(self):
+        game = make_game([('d1', 'red', 'General'), ('f10', 'black', 'General')])
+        self.assertFalse(game.is_in_check('red'))
+        game.set_piece(Chariot('black', 'a1'), 'a1')
+        self.assertTrue(game.is_in_check('red'))
+        game.set_piece(None, 'a1')
+        self.assertFalse(game.is_in_check('red'))
+
+    def test_load_snapshot_changes_result(self):
+        game = make_game([('d1', 'red', 'General'), ('f10', 'black', 'General')])
+        moves = game.get_legal_moves('red')
+        game.load_snapshot(((('d1', 'red', 'General'), ('f10', 'black', 'General'), ('a1', 'black', 'RChariot')),
+                            1, 'UNFINISHED'))
+        self.assertTrue(game.is_in_check('red'))
+        self.assertNotEqual(set(game.get_legal_moves('red')), set(moves))
+        self.assertEqual(set(game.get_legal_moves('red')), brute_force_moves(game, 'red'))
+
+    def test_do_and_undo_move(self):
+        game = XiangqiGame(verbose=False)
+        before = set(game.get_legal_moves('red'))
+        record = game.do_move('h3', 'e3')
+        self.assertEqual(set(game.get_legal_moves('red')), brute_force_moves(game, 'red'))
+        self.assertEqual(set(game.get_legal_moves('black')), brute_force_moves(game, 'black'))
+        game.undo_move(record)
+        hits = game.get_cache().get_stats()['hits']
+        self.assertEqual(set(game.get_legal_moves('red')), before)
+        self.assertEqual(game.get_cache().get_stats()['hits'], hits + 1)
+
+
+
+class StaticExchangeTest(unittest.TestCase):
+    """see() and get_attackers() follow the real move rules: Cannon screens, Horse legs, and facing Generals.
+    FastXiangqi must give the same results as XiangqiGame."""
+
+    GENERALS = [('f1', 'red', 'General'), ('d10', 'black', 'General')]
+
+    def assert_see(self, pieces, square_from, square_to, expected):
+        game = make_game(pieces)
+        self.assertEqual(game.see(square_from, square_to), expected)
+        fast = FastXiangqi.from_game(game)
+        self.assertEqual(fast.see((INDEX[square_from], INDEX[square_to])), expected)
+        self.assertEqual(fast.get_board(), FastXiangqi.from_game(game).get_board())
+
+    def test_attackers_least_valuable_first(self):
+        game = make_game(self.GENERALS + [('i5', 'red', 'RChariot'), ('e5', 'black', 'Horse'),
+                                          ('a5', 'red', 'Cannon'), ('c5', 'black', 'Elephant'),
+                                          ('c4', 'red', 'Horse'), ('e4', 'red', 'Soldier')])
+        attackers = game.get_attackers('e5', 'red')
+        self.assertEqual([piece.get_location() for piece in attackers], ['e4', 'c4', 'a5', 'i5'])
+        self.assertEqual(FastXiangqi.from_game(game).get_attackers(INDEX['e5']),
+                         [INDEX[square] for square in ('e4', 'c4', 'a5', 'i5')])
+
+    def test_defended_by_horse(self):
+        self.assert_see(self.GENERALS + [('a6', 'red', 'RChariot'), ('e6', 'black', 'Soldier'),
+                                         ('d8', 'black', 'Horse')], 'a6', 'e6', -800)
+
+    def test_horse_leg_blocked(self):
+        self.assert_see(self.GENERALS + [('a6', 'red', 'RChariot'), ('e6', 'black', 'Soldier'),
+                                         ('d8', 'black', 'Horse'), ('d7', 'red', 'Soldier')], 'a6', 'e6', 100)
+
+    def test_cannon_keeps_screen(self):
+        self.assert_see(self.GENERALS + [('e7', 'red', 'RChariot'), ('e5', 'black', 'Horse'),
+                                         ('e10', 'black', 'Cannon'), ('e8', 'black', 'Elephant')], 'e7', 'e5', -500)
+
+    def test_capturer_was_cannon_screen(self):
+        # The Chariot leaves e7, so the Cannon on e10 has nothing left to jump over.
+        self.assert_see(self.GENERALS + [('e7', 'red', 'RChariot'), ('e5', 'black', 'Horse'),
+                                         ('e10', 'black', 'Cannon')], 'e7', 'e5', 400)
+
+    def test_cannon_gains_screen(self):
+        # Behind two pieces the Cannon on e2 cannot capture; once the Chariot leaves e4, e3 is its only screen.
+        pieces = self.GENERALS + [('e4', 'red', 'RChariot'), ('e7', 'black', 'Horse'), ('a7', 'black', 'RChariot'),
+                                  ('e3', 'red', 'Soldier')]
+        self.assert_see(pieces, 'e4', 'e7', -500)
+        self.assert_see(pieces + [('e2', 'red', 'Cannon')], 'e4', 'e7', 400)
+
+    def test_general_may_not_face_general(self):
+        pieces = [('e1', 'red', 'General'), ('e10', 'black', 'General'), ('e9', 'black', 'Advisor'),
+                  ('a9', 'red', 'RChariot')]
+        self.assert_see(pieces, 'a9', 'e9', 200)
+        self.assert_see(pieces + [('e5', 'red', 'Soldier')], 'a9', 'e9', -700)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+# Author: Kenny Seng
+# Date: 10/19/2026
+# Description: Tests for GameHistory. Every position it shows, however it got there (seeking, stepping, or
+#              branching off with record), must match a fresh replay of the same moves.
+
+import random
+import unittest
+
+from XiangqiGame import XiangqiGame
+from fast_rules import FastXiangqi, SQUARES
+from history import GameHistory
+
+
+def random_moves(count, seed):
+    """Returns up to count random legal (square_from, square_to) moves from the starting position."""
+    rng = random.Random(seed)
+    position = FastXiangqi()
+    moves = []
+    for _ in range(count):
+        legal = position.legal_moves()
+        if len(legal) == 0:
+            break
+        move = rng.choice(legal)
+        position.play(move)
+        moves.append((SQUARES[move[0]], SQUARES[move[1]]))
+    return moves
+
+
+def replay(moves):
+    """Returns the (snapshot, hash) after each ply of a fresh replay of the moves, starting with ply 0."""
+    game = XiangqiGame(verbose=False)
+    positions = [(game.get_snapshot(), game.get_hash())]
+    for square_from, square_to in moves:
+        game.make_move(square_from, square_to)
+        positions.append((game.get_snapshot(), game.get_hash()))
+    return positions
+
+
+class GameHistoryTest(unittest.TestCase):
+    """Seeking, stepping, and branching all land on the same position as a fresh replay."""
+
+    def assert_at(self, history, ply, positions):
+        game = history.get_game()
+        self.assertEqual(history.get_ply(), ply)
+        self.assertEqual((game.get_snapshot(), game.get_hash()), positions[ply], 'ply ' + str(ply))
+
+    def test_random_seeks_match_replay(self):
+        moves = random_moves(90, 1)
+        positions = replay(moves)
+        history = GameHistory.from_moves(moves, checkpoint_interval=10)
+        self.assertEqual(history.get_length(), len(moves))
+        rng = random.Random(2)
+        for _ in range(300):
+            action = rng.random()
+            if action < 0.6:
+                ply = rng.randint(0, len(moves))
+                history.seek(ply)
+            elif action < 0.8:
+                ply = min(history.get_ply() + 1, len(moves))
+                history.step_forward()
+            else:
+                ply = max(history.get_ply() - 1, 0)
+                history.step_back()
+            self.assert_at(history, ply, positions)
+
+    def test_seek_out_of_range(self):
+        history = GameHistory.from_moves(random_moves(5, 3))
+        self.assertRaises(IndexError, history.seek, 6)
+        self.assertRaises(IndexError, history.seek, -1)
+
+    def test_step_back_past_restored_checkpoint(self):
+        moves = random_moves(25, 4)
+        positions = replay(moves)
+        history = GameHistory.from_moves(moves, checkpoint_interval=10)
+        history.to_start()
+        # Restores the checkpoint at ply 20 and steps forward, so only plies 21 to 23 have undo records.
+        history.seek(23)
+        for ply in range(22, -1, -1):
+            self.assertTrue(history.step_back())
+            self.assert_at(history, ply, positions)
+        self.assertFalse(history.step_back())
+
+    def test_record_at_earlier_ply_branches(self):
+        moves = random_moves(30, 5)
+        history = GameHistory.from_moves(moves, checkpoint_interval=5)
+        self.assertEqual(history.get_checkpoint_plies(), [0, 5, 10, 15, 20, 25, 30])
+
+        # Branch at ply 7 with a different move; every later move and checkpoint belongs to the old line.
+        history.seek(7)
+        branch = moves[:7]
+        game = history.get_game()
+        alternatives = [move for move in game.get_legal_moves(game.get_player_to_move()) if move != moves[7]]
+        branch.append(alternatives[0])
+        self.assertTrue(history.record(*alternatives[0]))
+        self.assertEqual(history.get_moves(), branch)
+        self.assertEqual(history.get_checkpoint_plies(), [0, 5])
+
+        # The new line gets its own checkpoints, and seeking within it never brings back the old one.
+        position = FastXiangqi.from_game(history.get_game())
+        rng = random.Random(7)
+        while len(branch) < 16:
+            legal = position.legal_moves()
+            move = rng.choice(legal)
+            position.play(move)
+            branch.append((SQUARES[move[0]], SQUARES[move[1]]))
+            self.assertTrue(history.record(*branch[-1]))
+        self.assertEqual(history.get_checkpoint_plies(), [0, 5, 10, 15])
+        positions = replay(branch)
+        for ply in (16, 3, 12, 9, 16, 0, 15):
+            history.seek(ply)
+            self.assert_at(history, ply, positions)
+
+
+if __name__ == '__main__':
+    unittest.main()